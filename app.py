@@ -1,14 +1,17 @@
 import streamlit as st
 import pandas as pd
 import os
+import time
 import base64
-import subprocess
-import sys
 import streamlit.components.v1 as components
 
-# --- IMPORT MODULE VISUALISASI SENDIRI ---
-# Pastikan folder 'visualization' ada dan file 'visual.py' ada di dalamnya
-from visualization import visual 
+# --- IMPORT MODULE SENDIRI ---
+# visualization.visual (plotly) di-import lazy di halaman yang butuh grafik saja
+from processing import dataset, filter_index, cube, anomaly
+from gis import web_map
+from pipeline import logs as pipeline_logs
+from pipeline import runner as pipeline_runner
+from pipeline import metrics as pipeline_metrics
 
 # --- 1. KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -20,7 +23,7 @@ st.set_page_config(
 # --- 2. FUNGSI UTILITIES (CSS & GAMBAR) ---
 def load_css(file_name):
     with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        return f.read()
 
 def get_img_as_base64(file_path):
     """Membaca file gambar, deteksi format, dan ubah ke Base64"""
@@ -41,7 +44,8 @@ def get_img_as_base64(file_path):
         
     return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
 
-def inject_sidebar_icons(icon_files):
+def sidebar_icons_css(icon_files):
+    """CSS ikon menu sidebar (gambar di-inline sebagai base64)"""
     css_icons = ""
     for index, file_name in enumerate(icon_files):
         icon_path = os.path.join("icon", file_name)
@@ -80,45 +84,130 @@ def inject_sidebar_icons(icon_files):
     }
     """
     
-    final_css = css_icons + custom_sidebar_css
-    st.markdown(f'<style>{final_css}</style>', unsafe_allow_html=True)
+    return css_icons + custom_sidebar_css
 
-# Panggil CSS
-css_path = os.path.join("assets", "style.css")
-if os.path.exists(css_path):
-    load_css(css_path)
-else:
-    st.warning(f"⚠️ File style.css tidak ditemukan.")
+@st.cache_resource
+def build_style_bundle(css_path, icon_files):
+    """style.css + ikon sidebar digabung jadi 1 blok <style>, dibangun 1x per proses (bukan tiap rerun)"""
+    css_found = os.path.exists(css_path)
+    css = load_css(css_path) if css_found else ""
+    return f'<style>{css}{sidebar_icons_css(icon_files)}</style>', css_found
 
 # --- 3. KONFIGURASI ICON MENU ---
-icon_list = [
+css_path = os.path.join("assets", "style.css")
+icon_list = (
     "beranda.png",
     "table.png",
     "statistik.png",
     "map.png",
     "update.png" 
-]
-inject_sidebar_icons(icon_list)
+)
+
+# Panggil CSS
+style_bundle, css_found = build_style_bundle(css_path, icon_list)
+st.markdown(style_bundle, unsafe_allow_html=True)
+if not css_found:
+    st.warning(f"⚠️ File style.css tidak ditemukan.")
 
 # --- 4. KONFIGURASI PATH DATA & SCRIPT ---
 FOLDER_DATA = 'data'
 FOLDER_SCRAPER = 'scraper' # Folder tempat script berada
 FOLDER_PROCESSING = 'processing'
-FILE_DATA = os.path.join(FOLDER_DATA, 'hasil_analisis_final.xlsx')
+FOLDER_GIS = 'gis'
+FILE_DATA = os.path.join(FOLDER_DATA, dataset.DATASET_FILENAME)
+FILE_CUBE = os.path.join(FOLDER_DATA, cube.CUBE_FILENAME)
 FILE_MAP = os.path.join(FOLDER_DATA, 'peta_gadget_jawa.html')
+FILE_MAP_STATS = os.path.join(FOLDER_DATA, web_map.STATS_FILENAME)
 
-# Path Lengkap ke Script Scraper
-SCRIPT_SCRAPER = os.path.join(FOLDER_SCRAPER, 'scraper_olx.py')
-SCRIPT_PROCESSOR = os.path.join(FOLDER_PROCESSING, 'processed_final_data.py')
+# Script pipeline (Scraper -> Processing -> Peta -> Publish) ada di pipeline/runner.py
+INTERVAL_REFRESH_JOB = 2  # Detik antar refresh panel job saat pipeline berjalan
 
 # --- 5. LOAD DATA ---
-@st.cache_data
-def load_data():
-    if os.path.exists(FILE_DATA):
-        return pd.read_excel(FILE_DATA)
-    return None
+# Semua cache di-key dengan versi file (mtime + ukuran). Begitu pipeline menulis file baru,
+# versi berubah -> setiap sesi/worker otomatis membaca ulang, tanpa st.cache_data.clear().
+def file_version(path):
+    """Versi file untuk key cache: berubah begitu file ditulis ulang (None jika file belum ada)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+@st.cache_resource(max_entries=2)
+def load_data(version):
+    """Dataset dibaca 1x per versi & dipakai bersama semua sesi (read-only, jangan dimodifikasi)"""
+    return dataset.load_dataset(path=FILE_DATA)
+
+DATA_VERSION = file_version(FILE_DATA)
+df = load_data(DATA_VERSION)
+
+@st.cache_resource(max_entries=2)
+def build_filter_index(_df, version):
+    """Index filter + metric ringkasan, dibangun 1x per versi dataset (bukan tiap interaksi widget)"""
+    return filter_index.FilterIndex(_df)
+
+@st.cache_data(max_entries=2)
+def load_cube(version, cube_version):
+    """Kubus agregat Provinsi x Brand x Kelas (dibangun dari dataset jika file kubus belum ada/basi)"""
+    return cube.load_or_build(FILE_DATA, FILE_CUBE)
+
+@st.cache_data(max_entries=2)
+def cube_figures(version, cube_version):
+    """Grafik Price Gap & Ekonomi Digital (dari kubus), dibuat ulang hanya jika versi data berubah"""
+    from visualization import visual
+    df_cube = load_cube(version, cube_version)
+    return visual.create_price_gap(df_cube), visual.create_economic_profile(df_cube)
+
+@st.cache_data(max_entries=32)
+def scam_detector_figure(_df, version, brand_choice):
+    """Box plot per brand, di-cache per (versi dataset, brand)"""
+    from visualization import visual
+    return visual.create_scam_detector(_df, brand_choice)
+
+@st.cache_data(max_entries=2)
+def load_map_html(stats_path, version):
+    """Peta ringan: geometri di-fetch browser dari /app/static (di-cache), statistik di-inline"""
+    return web_map.render_from_stats(stats_path)
+
+@st.cache_data(max_entries=2)
+def load_map_file(map_path, version):
+    """Fallback: HTML folium lengkap, dibaca dari disk sekali per versi file"""
+    with open(map_path, 'r', encoding='utf-8') as f:
+        return f.read()
 
-df = load_data()
+@st.cache_data(max_entries=2)
+def load_run_summary(version, n=5):
+    """Ringkasan n run pipeline terakhir dari metrics.jsonl + rincian run terbaru (dibaca 1x per versi file)"""
+    runs = pipeline_metrics.summarize_runs(pipeline_metrics.read_records(), n)
+    rows = []
+    for run in runs:
+        row = {
+            'Run': run['run_id'],
+            'Mulai': time.strftime('%Y-%m-%d %H:%M', time.localtime(run['mulai'])),
+            'Status': run['status'] or '-',
+        }
+        for tahap in pipeline_metrics.TAHAP:
+            row[f"{tahap.title()} (dtk)"] = run['durasi'].get(tahap)
+        row['Total (dtk)'] = run['total']
+        row['Listing Baru'] = pipeline_metrics.stage_event(run, 'scraper').get('baris_ditulis')
+        row['Baris Dataset'] = pipeline_metrics.stage_event(run, 'processing').get('baris_ditulis')
+        rows.append(row)
+
+    # Rincian run terbaru: per provinsi (scraper) & per langkah (processing, peta)
+    df_provinsi, df_langkah = pd.DataFrame(), pd.DataFrame()
+    if runs:
+        kolom = ['provinsi', 'engine', 'durasi', 'klik', 'item_dimuat', 'item_baru', 'item_per_detik', 'error']
+        provinsi = [r for r in runs[0]['events'] if r['tahap'] == 'scraper' and r['event'] == 'provinsi']
+        df_provinsi = pd.DataFrame(provinsi).reindex(columns=kolom).dropna(axis=1, how='all')
+        df_langkah = pd.DataFrame([
+            {'Tahap': tahap, 'Langkah': nama, 'Durasi (dtk)': durasi}
+            for tahap in ('processing', 'peta')
+            for nama, durasi in pipeline_metrics.stage_event(runs[0], tahap).get('langkah', {}).items()
+        ])
+    df_runs = pd.DataFrame(rows)
+    if not df_runs.empty:
+        df_runs = df_runs.astype({'Listing Baru': 'Int64', 'Baris Dataset': 'Int64'})
+    return df_runs, df_provinsi, df_langkah
 
 # --- 6. SIDEBAR NAVIGASI ---
 st.sidebar.title("FairPrice Map")
@@ -177,27 +266,48 @@ elif menu == "Data & Statistik":
     st.title("📂 Eksplorasi Data Scraping")
     
     if df is not None:
+        index = build_filter_index(df, DATA_VERSION)
+        metrics = index.metrics
+        
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Total Listings", f"{len(df):,}")
-        col2.metric("Harga Terendah", f"Rp {df['Harga_Int'].min():,.0f}")
-        col3.metric("Harga Rata-rata", f"Rp {df['Harga_Int'].mean():,.0f}")
-        col4.metric("Provinsi Terdata", f"{df['Provinsi'].nunique()}")
+        col1.metric("Total Listings", f"{metrics['total']:,}")
+        col2.metric("Harga Terendah", f"Rp {metrics['harga_min']:,.0f}")
+        col3.metric("Harga Rata-rata", f"Rp {metrics['harga_mean']:,.0f}")
+        col4.metric("Provinsi Terdata", f"{metrics['provinsi']}")
         
         st.divider()
         
         st.subheader("🔍 Filter Database")
         c1, c2 = st.columns(2)
         with c1:
-            prov_filter = st.multiselect("Pilih Provinsi:", df['Provinsi'].unique(), default=df['Provinsi'].unique())
+            prov_filter = st.multiselect("Pilih Provinsi:", index.provinsi, default=index.provinsi)
         with c2:
-            brand_filter = st.multiselect("Pilih Brand:", df['Brand'].unique(), default=['Iphone', 'Samsung'])
+            default_brand = [b for b in ['Iphone', 'Samsung'] if b in index.brands]
+            brand_filter = st.multiselect("Pilih Brand:", index.brands, default=default_brand)
+        
+        positions = index.positions(prov_filter, brand_filter)
+        kolom_tabel = ['Judul', 'Harga_Int', 'Brand', 'Kelas_Sosial', 'Provinsi', 'Lokasi_Detail']
+        kolom_tabel[3:3] = [c for c in ['Model', 'Varian', 'Storage_GB'] if c in df.columns]
         
-        filtered_df = df[
-            (df['Provinsi'].isin(prov_filter)) & 
-            (df['Brand'].isin(brand_filter))
-        ]
+        # Flag harga mencurigakan: skor sudah dihitung saat processing, cukup cek per listing
+        if 'Skor_Anomali' in df.columns:
+            kolom_tabel.append('Skor_Anomali')
+            if st.checkbox(f"🚨 Hanya harga mencurigakan (|skor| > {anomaly.BATAS_SKOR}, negatif = terlalu murah)"):
+                skor = df['Skor_Anomali'].to_numpy()
+                positions = positions[anomaly.is_suspicious(skor[positions])]
         
-        st.dataframe(filtered_df[['Judul', 'Harga_Int', 'Brand', 'Kelas_Sosial', 'Provinsi', 'Lokasi_Detail']], use_container_width=True)
+        # Pagination di server: browser hanya menerima 1 halaman, berapa pun jumlah listing
+        c3, c4 = st.columns([1, 3])
+        with c3:
+            page_size = st.selectbox("Baris per halaman:", filter_index.UKURAN_HALAMAN)
+        n_pages = filter_index.total_pages(len(positions), page_size)
+        with c4:
+            page = st.number_input(f"Halaman (1-{n_pages}):", min_value=1, max_value=n_pages, value=1, step=1)
+        
+        page_df = index.page(positions, page, page_size, kolom_tabel)
+        st.dataframe(page_df, use_container_width=True)
+        start_row = (page - 1) * page_size
+        st.caption(f"Menampilkan {min(start_row + 1, len(positions)):,}-{start_row + len(page_df):,} dari {len(positions):,} listing.")
     else:
         st.error("⚠️ File data tidak ditemukan.")
 
@@ -214,19 +324,19 @@ elif menu == "Visualisasi":
             st.subheader("Radar Deteksi Scam (Anomali Harga)")
             st.caption("Grafik ini interaktif! Arahkan mouse ke titik-titik di luar kotak untuk melihat detail.")
             brand_choice = st.selectbox("Pilih Brand:", df['Brand'].unique(), index=0)
-            fig1 = visual.create_scam_detector(df, brand_choice)
+            fig1 = scam_detector_figure(df, DATA_VERSION, brand_choice)
             st.plotly_chart(fig1, use_container_width=True)
 
+        fig2, fig3 = cube_figures(DATA_VERSION, file_version(FILE_CUBE))
+
         with tab2:
             st.subheader("Perbandingan Rata-rata Harga Antar Wilayah")
             st.caption("Membuktikan di mana tempat termurah untuk membeli gadget.")
-            fig2 = visual.create_price_gap(df)
             st.plotly_chart(fig2, use_container_width=True)
 
         with tab3:
             st.subheader("Profil Daya Beli Masyarakat")
             st.caption("Persentase HP Sultan vs Entry Level di setiap provinsi.")
-            fig3 = visual.create_economic_profile(df)
             st.plotly_chart(fig3, use_container_width=True)
     else:
         st.warning("Data belum dimuat.")
@@ -238,9 +348,15 @@ elif menu == "Map GIS":
     st.title("🗺️ Geo-Pricing Intelligence")
     st.write("Peta persebaran dominasi brand dan harga rata-rata.")
     
-    if os.path.exists(FILE_MAP):
-        with open(FILE_MAP, 'r', encoding='utf-8') as f:
-            map_html = f.read()
+    map_html = None
+    stats_version = file_version(FILE_MAP_STATS)
+    if st.get_option("server.enableStaticServing") and stats_version is not None:
+        map_html = load_map_html(FILE_MAP_STATS, stats_version)
+    map_version = file_version(FILE_MAP)
+    if map_html is None and map_version is not None:
+        map_html = load_map_file(FILE_MAP, map_version)
+
+    if map_html is not None:
         components.html(map_html, height=600, scrolling=True)
     else:
         st.error("⚠️ File peta tidak ditemukan.")
@@ -250,92 +366,79 @@ elif menu == "Map GIS":
 # ==============================================================================
 elif menu == "Update Data":
     st.title("⚙️ Update Database Real-Time")
-    st.write("Fitur ini akan menjalankan **Bot Scraper** lalu **Data Processing** secara otomatis.")
+    st.write("Fitur ini akan menjalankan **Bot Scraper**, **Data Processing**, **Update Peta**, lalu **Publish ke GitHub** secara otomatis.")
     
     col1, col2 = st.columns([1, 2])
+    running = pipeline_runner.is_running()
     
     with col1:
         st.warning("⚠️ **Perhatian:** Proses total memakan waktu 5-15 menit.")
-        start_btn = st.button("🚀 Mulai Update Full", type="primary")
+        st.caption("Pipeline berjalan di background: halaman boleh ditutup, pengunjung lain melihat job yang sama.")
+        start_btn = st.button("🚀 Mulai Update Full", type="primary", disabled=running)
+        
+        if start_btn:
+            # Lock single-flight: jika sudah ada job berjalan, UI cukup menempel ke job tersebut
+            if pipeline_runner.start_job() is None:
+                st.info("⏳ Pipeline lain sedang berjalan. Menampilkan progres job tersebut.")
+            st.rerun()
     
     with col2:
         st.subheader("Terminal Log:")
         
-        # --- PERUBAHAN DI SINI ---
-        # Membuat container dengan tinggi tetap 400px dan border
-        # Konten di dalamnya otomatis akan punya scrollbar jika panjang
-        with st.container(height=400, border=True):
-            log_container = st.empty()
-            # Pesan awal agar kotak tidak kosong melompong
-            log_container.code("Menunggu perintah...", language="bash")
-        # -------------------------
-        
-        # --- FUNGSI REUSABLE UNTUK MENJALANKAN SCRIPT ---
-        def run_script_in_subprocess(script_path, log_placeholder, current_logs):
-            """Menjalankan script python via subprocess dan streaming output ke UI"""
-            if not os.path.exists(script_path):
-                # Tampilkan error di dalam kotak log
-                current_logs += f"❌ File tidak ditemukan: {script_path}\n"
-                log_placeholder.code(current_logs, language="bash")
-                return False, current_logs
-
-            try:
-                current_logs += f"\n🔵 [SYSTEM] Menjalankan: {script_path}...\n"
-                log_placeholder.code(current_logs, language="bash")
-                
-                env = os.environ.copy()
-                env["PYTHONIOENCODING"] = "utf-8"
-                env["PYTHONUNBUFFERED"] = "1"
-
-                process = subprocess.Popen(
-                    [sys.executable, script_path],
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.STDOUT, 
-                    text=True, 
-                    bufsize=1,
-                    encoding='utf-8', 
-                    env=env
-                )
-                
-                while True:
-                    line = process.stdout.readline()
-                    if not line and process.poll() is not None:
-                        break
-                    if line:
-                        current_logs += line 
-                        # Update log. Karena sudah di dalam st.container(height=...), 
-                        # scrollbar akan muncul otomatis.
-                        log_placeholder.code(current_logs, language="bash") 
-                
-                if process.returncode == 0:
-                    current_logs += f"✅ [SUCCESS] {script_path} selesai.\n"
-                    return True, current_logs
-                else:
-                    current_logs += f"❌ [ERROR] {script_path} gagal (Code {process.returncode}).\n"
-                    return False, current_logs
-
-            except Exception as e:
-                current_logs += f"❌ [EXCEPTION] {e}\n"
-                log_placeholder.code(current_logs, language="bash")
-                return False, current_logs
-
-        # --- EKSEKUSI BERANTAI (CHAINING) ---
-        if start_btn:
-            full_logs = ""
+        # Panel job di-refresh sendiri (fragment) selama pipeline berjalan, tanpa rerun seluruh halaman
+        @st.fragment(run_every=INTERVAL_REFRESH_JOB if running else None)
+        def job_panel():
+            job = pipeline_runner.read_job()
+            if job is None:
+                st.info("Belum pernah ada job update.")
+            else:
+                langkah = f"langkah {job.get('langkah', 0)}/{job.get('total_langkah', 0)}"
+                if job.get('nama_langkah'):
+                    langkah += f" ({job['nama_langkah']})"
+                st.caption(f"Job `{job['job_id']}` • status: **{job['status']}** • {langkah}")
+                if job['status'] == pipeline_runner.STATUS_JALAN:
+                    st.progress(max(job.get('langkah', 1) - 1, 0) / max(job.get('total_langkah', 1), 1))
             
-            # 1. JALANKAN SCRAPER
-            success_scraper, full_logs = run_script_in_subprocess(SCRIPT_SCRAPER, log_container, full_logs)
+            # Container tinggi tetap 400px, scrollbar otomatis; hanya N baris terakhir log job ini yang dikirim
+            with st.container(height=400, border=True):
+                lines = pipeline_logs.tail_lines(pipeline_logs.job_log_path(job['job_id'])) if job else []
+                st.code("\n".join(lines) if lines else "Menunggu perintah...", language="bash")
             
-            if success_scraper:
-                # 2. JALANKAN PROCESSING (Hanya jika Scraper Berhasil)
-                success_process, full_logs = run_script_in_subprocess(SCRIPT_PROCESSOR, log_container, full_logs)
-                
-                if success_process:
-                    st.success("🎉 Seluruh proses selesai! Database telah diperbarui.")
-                    st.balloons()
-                    st.cache_data.clear() # Hapus cache agar data baru terbaca
-                else:
-                    st.error("⚠️ Scraper berhasil, tetapi Processing gagal.")
+            # Job selesai saat panel sedang menempel -> rerun penuh (hentikan polling & tampilkan hasil)
+            if running and job is not None and job['status'] != pipeline_runner.STATUS_JALAN:
+                st.session_state['job_selesai_ditonton'] = job['job_id']
+                st.rerun(scope="app")
+        
+        job_panel()
+    
+    # --- HASIL JOB TERAKHIR ---
+    job = pipeline_runner.read_job()
+    if job is not None and not running:
+        # Balon hanya untuk sesi yang menonton job sampai selesai. Cache tidak perlu dihapus:
+        # versi file baru otomatis membuat semua sesi membaca data terbaru.
+        ditonton = st.session_state.pop('job_selesai_ditonton', None) == job['job_id']
+        if job['status'] == pipeline_runner.STATUS_SUKSES:
+            if any(h['kode'] != 0 for h in job.get('hasil_langkah', [])):
+                st.warning(f"⚠️ Database diperbarui, tetapi ada langkah yang gagal: {job['pesan']}")
             else:
-                st.error("⚠️ Proses Scraping gagal. Processing dibatalkan.")
-
+                st.success("🎉 Seluruh proses selesai! Database & peta telah diperbarui.")
+            if ditonton:
+                st.balloons()
+        elif job['status'] == pipeline_runner.STATUS_GAGAL:
+            st.error(f"⚠️ {job['pesan']}")
+    
+    # --- RINGKASAN RUN TERAKHIR (metrik terstruktur, lihat pipeline/metrics.py) ---
+    st.divider()
+    st.subheader("📈 Ringkasan Run Terakhir")
+    df_runs, df_provinsi, df_langkah = load_run_summary(file_version(pipeline_metrics.METRICS_PATH))
+    if df_runs.empty:
+        st.info("Belum ada metrik run. Metrik dicatat otomatis setiap pipeline berjalan.")
+    else:
+        st.dataframe(df_runs, hide_index=True, use_container_width=True)
+        with st.expander(f"🔎 Rincian run {df_runs['Run'].iloc[0]}"):
+            if not df_provinsi.empty:
+                st.caption("Scraper per provinsi (durasi dalam detik):")
+                st.dataframe(df_provinsi, hide_index=True, use_container_width=True)
+            if not df_langkah.empty:
+                st.caption("Durasi per langkah:")
+                st.dataframe(df_langkah, hide_index=True, use_container_width=True)
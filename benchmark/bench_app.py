@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import statistics
+
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+# --- KONFIGURASI ---
+APP_PATH = os.path.join(BASE_DIR, 'app.py')
+MENU = ["Beranda", "Data & Statistik", "Visualisasi", "Map GIS", "Update Data"]
+MODUL_BERAT = ["plotly.express", "folium", "github"]  # Idealnya belum ter-import saat halaman Beranda
+# (plotly.graph_objects sudah di-import oleh streamlit sendiri untuk tema grafik)
+ULANG = 10  # Jumlah rerun (interaksi) per menu
+
+def measure(ulang=ULANG):
+    """Jalankan app lewat AppTest di proses ini. Return dict hasil (detik)."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    t_import = time.perf_counter() - start
+
+    os.chdir(BASE_DIR)  # app.py membaca path relatif (data/, icon/, assets/)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    hasil = {
+        'import_streamlit': t_import,
+        'cold_start': time.perf_counter() - start,
+        'modul_saat_beranda': [m for m in MODUL_BERAT if m in sys.modules],
+        'menu': {},
+    }
+
+    for menu in MENU:
+        at.sidebar.radio[0].set_value(menu)
+        start = time.perf_counter()
+        at.run()
+        t_first = time.perf_counter() - start
+
+        times = []
+        for _ in range(ulang):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+        times.sort()
+        hasil['menu'][menu] = {
+            'pertama': t_first,
+            'median': statistics.median(times),
+            'p90': times[min(len(times) - 1, int(round(0.9 * (len(times) - 1))))],
+            'error': [str(e.value) for e in at.exception],
+        }
+    return hasil
+
+def run(ulang):
+    # Proses baru = cold start sungguhan (import & cache resource masih kosong)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--ulang", str(ulang)],
+        capture_output=True, text=True, encoding='utf-8', cwd=BASE_DIR,
+    )
+    if out.returncode != 0:
+        print(f"❌ Benchmark gagal:\n{out.stderr[-2000:]}")
+        return
+    hasil = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print("📏 Benchmark latency Streamlit (AppTest, tanpa browser)")
+    print(f"   Import streamlit   : {hasil['import_streamlit'] * 1000:8.1f} ms")
+    print(f"   Cold start Beranda : {hasil['cold_start'] * 1000:8.1f} ms")
+    print(f"   Modul berat setelah Beranda: {', '.join(hasil['modul_saat_beranda']) or '-'}")
+    print(f"{'Menu':>18} | {'Pertama':>9} | {'Rerun p50':>9} | {'Rerun p90':>9}")
+    for menu, m in hasil['menu'].items():
+        print(f"{menu:>18} | {m['pertama'] * 1000:7.1f}ms | {m['median'] * 1000:7.1f}ms | {m['p90'] * 1000:7.1f}ms"
+              + (f"  ⚠️ {m['error']}" if m['error'] else ""))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold start & rerun app.py per menu")
+    parser.add_argument("--ulang", type=int, default=ULANG, help="Jumlah rerun per menu")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        hasil = measure(args.ulang)
+        print(json.dumps(hasil))
+    else:
+        run(args.ulang)
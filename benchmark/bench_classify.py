@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import classify
+
+# --- KONFIGURASI ---
+CSV_SAMPLE = os.path.join(BASE_DIR, 'data', 'data_hp_jawa_fix_lokasi.csv')
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 3_000_000]
+LEGACY_MAX_ROWS = 200_000  # Versi apply lama terlalu lambat untuk ukuran besar
+
+# --- VERSI LAMA (Series.apply) SEBAGAI PEMBANDING ---
+def legacy_extract_brand(title):
+    title_lower = str(title).lower()
+    for brand in classify.BRANDS:
+        if brand in title_lower:
+            return classify.BRAND_ALIAS.get(brand, brand.capitalize())
+    return classify.DEFAULT_BRAND
+
+def legacy_categorize_class(price):
+    if price > 5000000: return classify.KELAS_LABELS[2]
+    elif 2000000 <= price <= 5000000: return classify.KELAS_LABELS[1]
+    else: return classify.KELAS_LABELS[0]
+
+def make_titles(n, unique_ratio, rng):
+    """Judul sintetis dari data asli + suffix nomor (mengatur rasio judul unik)"""
+    base = pd.read_csv(CSV_SAMPLE, usecols=['Judul'])['Judul'].astype(str).to_numpy()
+    n_unique = max(1, int(n * unique_ratio))
+    pool = np.char.add(np.char.add(rng.choice(base, size=n_unique).astype(str), ' #'), np.arange(n_unique).astype(str))
+    return pd.Series(rng.choice(pool, size=n))
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run(sizes, unique_ratio):
+    rng = np.random.default_rng(42)
+    print(f"📏 Benchmark klasifikasi (rasio judul unik: {unique_ratio:.0%})")
+    print(f"{'Baris':>10} | {'Brand lama':>11} | {'Brand vektor':>12} | {'Kelas lama':>10} | {'Kelas vektor':>12} | {'Baris/detik':>12}")
+
+    for n in sizes:
+        judul = make_titles(n, unique_ratio, rng)
+        harga = pd.Series(rng.integers(100_000, 30_000_000, size=n))
+
+        brand_new, t_brand = timed(lambda: classify.extract_brand(judul))
+        kelas_new, t_kelas = timed(lambda: classify.categorize_class(harga))
+
+        if n <= LEGACY_MAX_ROWS:
+            brand_old, t_brand_old = timed(lambda: judul.apply(legacy_extract_brand))
+            kelas_old, t_kelas_old = timed(lambda: harga.apply(legacy_categorize_class))
+            # Kelas harus identik. Brand boleh beda hanya karena lower() Unicode (mis. 'İphone').
+            assert (kelas_old == kelas_new.astype(str)).all(), "Hasil kelas berbeda!"
+            beda = brand_old != brand_new.astype(str)
+            assert judul[beda].str.contains('İ').all(), "Hasil brand berbeda!"
+            old_brand, old_kelas = f"{t_brand_old:.3f}s", f"{t_kelas_old:.3f}s"
+        else:
+            old_brand = old_kelas = "-"
+
+        rate = n / (t_brand + t_kelas)
+        print(f"{n:>10,} | {old_brand:>11} | {t_brand:>11.3f}s | {old_kelas:>10} | {t_kelas:>11.3f}s | {rate:>12,.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark extract_brand & categorize_class")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="Jumlah baris yang diuji")
+    parser.add_argument("--unique-ratio", type=float, default=0.3, help="Rasio judul unik (0-1]")
+    args = parser.parse_args()
+    run(args.sizes, args.unique_ratio)
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import dataset, filter_index
+
+# --- KONFIGURASI ---
+DEFAULT_SIZES = [10_000, 100_000, 500_000, 1_000_000]
+KOLOM_TABEL = ['Judul', 'Harga_Int', 'Brand', 'Kelas_Sosial', 'Provinsi', 'Lokasi_Detail']
+ULANG = 20  # Jumlah interaksi filter yang disimulasikan per ukuran
+
+def timed(fn, repeat=ULANG):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+def run(sizes):
+    base = dataset.load_dataset()
+    if base is None:
+        print("❌ Dataset tidak ditemukan. Jalankan processing dulu.")
+        return
+    rng = np.random.default_rng(42)
+    print("📏 Benchmark filter Data & Statistik (per interaksi widget)")
+    print(f"{'Baris':>10} | {'Build index':>11} | {'Mask isin':>10} | {'Index':>8} | {'Hasil':>9} | {'Percepatan':>10}")
+
+    for n in sizes:
+        df = base.iloc[rng.integers(0, len(base), size=n)].reset_index(drop=True)
+        prov = list(df['Provinsi'].cat.categories)
+        brands = ['Iphone', 'Samsung']
+
+        index, t_build = timed(lambda: filter_index.FilterIndex(df), repeat=1)
+
+        # Versi lama: metric + mask isin + kirim seluruh hasil filter ke tabel
+        def lama():
+            df['Harga_Int'].min(), df['Harga_Int'].mean(), df['Provinsi'].nunique()
+            return df[df['Provinsi'].isin(prov) & df['Brand'].isin(brands)][KOLOM_TABEL]
+
+        # Versi baru: metric dari cache index + posisi pasangan + 1 halaman saja
+        def baru():
+            positions = index.positions(prov, brands)
+            index.page(positions, 1, filter_index.UKURAN_HALAMAN[0], KOLOM_TABEL)
+            return positions
+
+        hasil_lama, t_lama = timed(lama)
+        positions, t_baru = timed(baru)
+        assert len(hasil_lama) == len(positions), "Jumlah hasil filter berbeda!"
+        print(f"{n:>10,} | {t_build * 1000:>9.1f}ms | {t_lama * 1000:>8.1f}ms | {t_baru * 1000:>6.1f}ms | {len(positions):>9,} | {t_lama / t_baru:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark filter index vs mask isin")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    run(args.sizes)
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+from processing import dataset, price_index
+
+# --- FAIRPRICE QUERY SERVICE ---
+# Layanan lokal "harga wajar X di Y" tanpa membuka Streamlit:
+#   python fairprice.py serve --port 8766
+#   curl "http://127.0.0.1:8766/harga?model=iphone%2011&provinsi=jawa%20barat"
+#   python fairprice.py query --model "iPhone 11 Pro" --storage 256 --provinsi "Jawa Barat"
+#   python fairprice.py bench
+# Index dibangun ulang otomatis saat file dataset berubah (hot reload).
+
+# --- KONFIGURASI ---
+HOST = "127.0.0.1"
+PORT = 8766
+INTERVAL_CEK = 5.0   # Detik antar pengecekan versi dataset
+
+class IndexHolder:
+    """Pemegang index aktif. Index baru dibangun di samping lalu ditukar (query tidak pernah menunggu build)"""
+
+    def __init__(self, path=dataset.DATASET_PATH):
+        self.path = path
+        self.index = price_index.PriceIndex.from_file(path)
+
+    def reload_if_changed(self):
+        if not os.path.exists(self.path):
+            return False
+        current = self.index.version if self.index is not None else None
+        if price_index.file_version(self.path) == current:
+            return False
+        try:
+            self.index = price_index.PriceIndex.from_file(self.path)
+        except Exception as e:
+            print(f"⚠️ Reload index gagal (index lama tetap dipakai): {e}")
+            return False
+        print(f"🔄 Index dimuat ulang: {len(self.index)} key dari {self.index.rows} listing.")
+        return True
+
+    def watch(self, interval=INTERVAL_CEK):
+        def _loop():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+        threading.Thread(target=_loop, daemon=True).start()
+
+def make_handler(holder):
+    class FairPriceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive: 1 koneksi untuk banyak query
+        disable_nagle_algorithm = True  # Header & body ditulis terpisah; tanpa ini tiap respons tertahan delayed ACK ~40ms
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            index = holder.index
+
+            if parsed.path == "/health":
+                self._send_json(200, {
+                    "status": "ok" if index is not None else "tanpa dataset",
+                    "key": len(index) if index is not None else 0,
+                    "versi": list(index.version) if index is not None else None,
+                })
+            elif parsed.path == "/harga":
+                if index is None:
+                    self._send_json(503, {"error": "Dataset belum tersedia"})
+                    return
+                if not params.get("brand") and not params.get("model"):
+                    self._send_json(400, {"error": "Isi parameter 'brand' atau 'model'"})
+                    return
+                hasil = index.lookup(params.get("brand"), params.get("model"), params.get("provinsi"),
+                                     params.get("varian"), params.get("storage"))
+                if hasil is None:
+                    self._send_json(404, {"error": "Tidak ada data untuk query ini", "query": params})
+                else:
+                    self._send_json(200, {"query": params, **hasil})
+            else:
+                self._send_json(404, {"error": "Endpoint: /harga?brand=&model=&varian=&storage=&provinsi= atau /health"})
+
+        def log_message(self, format, *args):
+            pass  # Jangan banjiri terminal
+
+    return FairPriceHandler
+
+def serve(holder, host=HOST, port=PORT, interval=INTERVAL_CEK):
+    server = ThreadingHTTPServer((host, port), make_handler(holder))
+    server.daemon_threads = True
+    holder.watch(interval)
+    return server
+
+def format_rupiah(angka):
+    return f"Rp {angka:,.0f}".replace(",", ".")
+
+def sample_queries(holder, n, seed=42):
+    """Query acak dari key yang ada di index (campur level spesifik & umum, plus yang tidak ada)"""
+    rng = random.Random(seed)
+    keys = [g['grup'] for g in holder.index.table.values()]
+    queries = []
+    for _ in range(n):
+        grup = rng.choice(keys)
+        q = {'model': grup.get('Model'), 'brand': grup.get('Brand'), 'provinsi': grup.get('Provinsi'),
+             'varian': grup.get('Varian'), 'storage': grup.get('Storage_GB')}
+        if rng.random() < 0.05:
+            q['model'] = 'Tidak Ada 99'
+        queries.append({k: v for k, v in q.items() if v})
+    return queries
+
+def run_bench(holder, n_requests, threads):
+    """Latency lookup in-memory & HTTP (keep-alive) dengan p50/p99"""
+    if holder.index is None:
+        print("❌ Dataset tidak ditemukan. Jalankan processing dulu.")
+        return
+    queries = sample_queries(holder, n_requests)
+    index = holder.index
+
+    # 1. Lookup langsung (tanpa jaringan)
+    lat = []
+    for q in queries:
+        start = time.perf_counter_ns()
+        index.lookup(q.get('brand'), q.get('model'), q.get('provinsi'), q.get('varian'), q.get('storage'))
+        lat.append(time.perf_counter_ns() - start)
+    p = price_index.percentiles_ms(lat)
+    print(f"⚡ Lookup index ({len(lat)} query): p50 {p['p50'] * 1000:.1f}µs | p99 {p['p99'] * 1000:.1f}µs | maks {p['max'] * 1000:.1f}µs")
+
+    # 2. HTTP lokal, server di thread terpisah (port acak)
+    server = serve(holder, HOST, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    latencies = [[] for _ in range(threads)]
+
+    def _worker(i):
+        conn = http.client.HTTPConnection(HOST, port)
+        for q in queries[i::threads]:
+            start = time.perf_counter_ns()
+            conn.request("GET", "/harga?" + urlencode(q))
+            conn.getresponse().read()
+            latencies[i].append(time.perf_counter_ns() - start)
+        conn.close()
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=_worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    semua = [x for lst in latencies for x in lst]
+    p = price_index.percentiles_ms(semua)
+    print(f"🌐 HTTP ({threads} koneksi): p50 {p['p50']:.2f}ms | p99 {p['p99']:.2f}ms | maks {p['max']:.2f}ms | {len(semua) / elapsed:,.0f} req/detik")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FairPrice: layanan query harga wajar")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data", default=dataset.DATASET_PATH, help="Path dataset Parquet")
+
+    p_serve = sub.add_parser("serve", parents=[common], help="Jalankan HTTP service")
+    p_serve.add_argument("--host", default=HOST)
+    p_serve.add_argument("--port", type=int, default=PORT)
+    p_serve.add_argument("--interval", type=float, default=INTERVAL_CEK, help="Detik antar cek dataset baru")
+
+    p_query = sub.add_parser("query", parents=[common], help="Query sekali dari terminal")
+    p_query.add_argument("--brand")
+    p_query.add_argument("--model", help="Boleh lengkap, mis. \"iPhone 11 Pro 256GB\"")
+    p_query.add_argument("--varian", help="Mis. Pro, Pro Max, Standar (default: dari --model)")
+    p_query.add_argument("--storage", help="Mis. 128 atau 1TB (default: dari --model)")
+    p_query.add_argument("--provinsi")
+
+    p_bench = sub.add_parser("bench", parents=[common], help="Benchmark latency lookup & HTTP")
+    p_bench.add_argument("--requests", type=int, default=20000)
+    p_bench.add_argument("--threads", type=int, default=4)
+
+    args = parser.parse_args()
+    holder = IndexHolder(args.data)
+
+    if args.cmd == "serve":
+        if holder.index is None:
+            print(f"⚠️ Dataset belum ada ({args.data}). Service tetap jalan & menunggu dataset.")
+        server = serve(holder, args.host, args.port, args.interval)
+        print(f"💰 FairPrice aktif di http://{args.host}:{args.port}/harga")
+        server.serve_forever()
+    elif args.cmd == "query":
+        hasil = (holder.index.lookup(args.brand, args.model, args.provinsi, args.varian, args.storage)
+                 if holder.index else None)
+        if hasil is None:
+            print("❌ Tidak ada data untuk query ini.")
+            sys.exit(1)
+        print(f"📍 {hasil['grup']} (level {hasil['level']}, {hasil['n']} listing)")
+        print(f"💰 Harga wajar: {format_rupiah(hasil['bawah'])} - {format_rupiah(hasil['atas'])} (median {format_rupiah(hasil['tengah'])})")
+    else:
+        run_bench(holder, args.requests, args.threads)
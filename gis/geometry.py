@@ -0,0 +1,81 @@
+import os
+import json
+import hashlib
+import numpy as np
+import shapely
+from shapely.geometry import shape, mapping
+
+# --- KONFIGURASI ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+
+TOLERANSI_SIMPLIFY = 0.005   # Derajat (~500 m), cukup untuk peta level provinsi
+PRESISI_KOORDINAT = 4        # Jumlah desimal koordinat (~11 m)
+
+# Nama provinsi di dataset -> NAME_1 di GADM JSON
+GADM_MAP = {
+    "DKI Jakarta": "JakartaRaya",
+    "DI Yogyakarta": "Yogyakarta",
+    "Jawa Barat": "JawaBarat",
+    "Jawa Tengah": "JawaTengah",
+    "Jawa Timur": "JawaTimur",
+    "Banten": "Banten"
+}
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def cache_path(src_path, names, tolerance=TOLERANSI_SIMPLIFY, precision=PRESISI_KOORDINAT):
+    """Nama file cache = hash file sumber + parameter (berubah otomatis jika salah satunya berubah)"""
+    params = f"{','.join(sorted(names))}|{tolerance}|{precision}"
+    key = f"{file_hash(src_path)[:16]}_{hashlib.sha256(params.encode()).hexdigest()[:8]}"
+    return os.path.join(CACHE_DIR, f"geometry_{key}.json")
+
+def simplify_features(features, tolerance=TOLERANSI_SIMPLIFY, precision=PRESISI_KOORDINAT):
+    """Simplify dengan menjaga topologi (batas antar provinsi tetap berimpit) + kuantisasi koordinat"""
+    geoms = [shape(f['geometry']) for f in features]
+    if hasattr(shapely, 'coverage_simplify'):
+        # Batas yang dipakai bersama 2 provinsi di-simplify sekali -> tanpa celah/tumpang tindih
+        geoms = shapely.coverage_simplify(geoms, tolerance)
+    else:
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=True)
+
+    # Snap ke grid 10^-presisi (tetap valid), lalu bulatkan agar JSON ringkas
+    geoms = shapely.set_precision(geoms, 10 ** -precision)
+    geoms = shapely.transform(geoms, lambda coords: np.round(coords, precision))
+
+    hasil = []
+    for f, geom in zip(features, geoms):
+        hasil.append({
+            'type': 'Feature',
+            'properties': {'NAME_1': f['properties'].get('NAME_1', '')},
+            'geometry': mapping(geom),
+        })
+    return hasil
+
+def load_geometry(src_path, names=GADM_MAP.values(), tolerance=TOLERANSI_SIMPLIFY, precision=PRESISI_KOORDINAT):
+    """
+    GeoJSON provinsi yang dipakai saja (default: Pulau Jawa), sudah di-simplify.
+    Hasil di-cache di data/cache/ dengan key hash file sumber, jadi GADM 3 MB cukup dibaca sekali.
+    """
+    names = set(names)
+    path = cache_path(src_path, names, tolerance, precision)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), path
+
+    with open(src_path, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    features = [f for f in source['features'] if f['properties'].get('NAME_1', '') in names]
+    geojson = {'type': 'FeatureCollection', 'features': simplify_features(features, tolerance, precision)}
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(geojson, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return geojson, path
@@ -1,11 +1,21 @@
 import pandas as pd
-import folium
-import json
 import os
+import sys
+import json
+import hashlib
+import argparse
+
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import dataset, cube
+from gis import geometry, web_map
+from pipeline import metrics
 
 # --- KONFIGURASI PATH ---
 FOLDER_NAME = 'data'
-INPUT_FILENAME = 'hasil_analisis_final.xlsx'  # Langsung baca Excel
+INPUT_FILENAME = dataset.DATASET_FILENAME     # Dataset Parquet hasil processing
 GEOJSON_FILENAME = 'gadm41_IDN_1.json'        # Pastikan file ini ada di folder data
 OUTPUT_MAP_NAME = 'peta_gadget_jawa.html'
 
@@ -14,16 +24,88 @@ INPUT_DATA_PATH = os.path.join(FOLDER_NAME, INPUT_FILENAME)
 INPUT_GEOJSON_PATH = os.path.join(FOLDER_NAME, GEOJSON_FILENAME)
 OUTPUT_MAP_PATH = os.path.join(FOLDER_NAME, OUTPUT_MAP_NAME)
 
+# State hash input peta (ringkasan per provinsi + geometri). Sama -> peta tidak dibangun ulang
+STATE_FILE_PATH = os.path.join(FOLDER_NAME, 'map_state.json')
+MAP_VERSION = 1  # Naikkan jika tampilan/format peta diubah agar semua peta dibangun ulang
+
+# Mapping Nama (dataset -> GADM JSON), lihat gis/geometry.py
+gadm_map = geometry.GADM_MAP
+
 def format_rupiah(angka):
     return f"Rp {angka:,.0f}".replace(",", ".")
 
-def create_gis_map():
+def normalize_name(name):
+    """Pencocokan nama (Case Insensitive & Hapus Spasi)"""
+    return str(name).lower().replace(" ", "")
+
+def build_summary(df_cube):
+    """
+    Ringkasan per provinsi: dominasi iPhone vs Android + Top 3 brand (rata-rata harga).
+    Dihitung dari kubus agregat (processing/cube.py), bukan dari listing mentah.
+    """
+    stats = cube.rollup(df_cube, ['Provinsi', 'Brand']).rename(columns={'Jumlah': 'size', 'Harga_Rata': 'mean'})
+    stats['Provinsi'] = stats['Provinsi'].astype(str)
+    stats['Brand'] = stats['Brand'].astype(str)
+
+    # A. Hitung Dominasi (iPhone vs Android) -> cukup cek nama brand, bukan tiap listing
+    stats['is_iphone'] = stats['Brand'].str.contains('Iphone|Apple', case=False, na=False)
+    total = stats.groupby('Provinsi')['size'].sum()
+    iphone_count = stats[stats['is_iphone']].groupby('Provinsi')['size'].sum().reindex(total.index, fill_value=0)
+    dominan_iphone = iphone_count > (total - iphone_count)
+
+    # B. Cari Top 3 HP (urut jumlah listing terbanyak per provinsi)
+    top = stats.sort_values(['Provinsi', 'size'], ascending=[True, False], kind='stable')
+    top = top.groupby('Provinsi').head(3).copy()
+    top['rank'] = top.groupby('Provinsi').cumcount()
+    top['label'] = top['Brand'] + ' (' + top['mean'].map(format_rupiah) + ')'
+    hp = top.pivot(index='Provinsi', columns='rank', values='label').reindex(index=total.index, columns=range(3)).fillna('-')
+
+    return pd.DataFrame({
+        'Provinsi': total.index,
+        'Dominant_Label': dominan_iphone.map({True: "🍏 Dominan iPhone", False: "🤖 Dominan Android"}).to_numpy(),
+        'Color': dominan_iphone.map({True: "#ff4d4d", False: "#7bed9f"}).to_numpy(), # Merah / Hijau
+        'HP_1': hp[0].to_numpy(),
+        'HP_2': hp[1].to_numpy(),
+        'HP_3': hp[2].to_numpy(),
+        'Total_Listing': total.to_numpy()
+    })
+
+def summary_hash(df_summary, geojson_path):
+    """Hash konten semua input peta: ringkasan per provinsi + file GeoJSON sumber + versi format"""
+    h = hashlib.sha256()
+    h.update(f"v{MAP_VERSION}|{geometry.file_hash(geojson_path)}|".encode())
+    h.update(df_summary.to_json(orient='records', force_ascii=False).encode('utf-8'))
+    return h.hexdigest()
+
+def load_state():
+    if not os.path.exists(STATE_FILE_PATH):
+        return {}
+    try:
+        with open(STATE_FILE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def save_state(state):
+    tmp_path = STATE_FILE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_FILE_PATH)
+
+def create_gis_map(force=False):
+    """Bangun peta + metrik terstruktur (durasi per langkah, status build, ukuran output)"""
+    with metrics.Timer('peta', 'selesai', force=force) as metrik:
+        _create_gis_map(force, metrik)
+
+def _create_gis_map(force, metrik):
+    sw = metrics.Stopwatch()
+    metrik.update(langkah=sw.laps, status='gagal')
     print(f"📂 Membaca data dari: {INPUT_DATA_PATH}...")
     
     # 1. Validasi File
     if not os.path.exists(INPUT_DATA_PATH):
         print(f"❌ Error: File '{INPUT_DATA_PATH}' tidak ditemukan.")
-        print("👉 Pastikan file 'hasil_analisis_final.xlsx' ada di dalam folder 'data'.")
+        print(f"👉 Pastikan file '{INPUT_FILENAME}' ada di dalam folder 'data'.")
         return
 
     if not os.path.exists(INPUT_GEOJSON_PATH):
@@ -31,113 +113,84 @@ def create_gis_map():
         print("👉 Pastikan file JSON GADM ada di dalam folder 'data'.")
         return
 
-    # 2. Load Data Excel
+    # 2. Load Kubus Agregat (dibangun dari dataset jika belum ada / lebih lama dari dataset)
     try:
-        # Menggunakan read_excel karena user meminta file xlsx
-        df = pd.read_excel(INPUT_DATA_PATH)
-        print(f"✅ Berhasil memuat {len(df)} baris data dari Excel.")
+        df_cube = cube.load_or_build(INPUT_DATA_PATH, os.path.join(FOLDER_NAME, cube.CUBE_FILENAME))
+        print(f"✅ Berhasil memuat kubus agregat ({len(df_cube)} sel, {df_cube['Jumlah'].sum()} listing).")
+        sw.lap('kubus')
     except Exception as e:
-        print(f"❌ Gagal membaca file Excel: {e}")
+        print(f"❌ Gagal membaca file dataset: {e}")
         return
 
-    # 3. Load GeoJSON GADM
-    print(f"🌍 Membaca peta GADM dari: {INPUT_GEOJSON_PATH}...")
+    # 3. Analisis Data Per Provinsi (1x groupby untuk semua provinsi)
+    print("🧮 Menghitung statistik wilayah...")
+    df_summary = build_summary(df_cube)
+    metrik['provinsi'] = len(df_summary)
+    sw.lap('ringkasan')
+
+    # 4. Cek apakah input peta berubah sejak build terakhir
+    input_hash = summary_hash(df_summary, INPUT_GEOJSON_PATH)
+    outputs_ada = os.path.exists(OUTPUT_MAP_PATH) and os.path.exists(web_map.STATS_PATH)
+    if not force and outputs_ada and load_state().get('summary_hash') == input_hash:
+        print("⏭️ Ringkasan wilayah tidak berubah. Peta tidak perlu dibangun ulang.")
+        metrik['status'] = 'skip'
+        return
+
+    # 5. Load GeoJSON GADM (hanya provinsi yang dipakai, sudah di-simplify & di-cache)
+    print(f"🌍 Menyiapkan geometri dari: {INPUT_GEOJSON_PATH}...")
     try:
-        with open(INPUT_GEOJSON_PATH, 'r') as f:
-            indo_geojson = json.load(f)
+        gadm_names = set(gadm_map.values()) | {gadm_map.get(p, p) for p in df_summary['Provinsi']}
+        indo_geojson, geometry_path = geometry.load_geometry(INPUT_GEOJSON_PATH, gadm_names)
+        sw.lap('geometri')
+        print(f"   ✅ {len(indo_geojson['features'])} provinsi ({os.path.getsize(geometry_path) / 1024:.0f} KB, cache: {os.path.basename(geometry_path)})")
     except Exception as e:
         print(f"❌ Gagal baca file GeoJSON: {e}")
         return
 
-    # 4. Analisis Data Per Provinsi
-    print("🧮 Menghitung statistik wilayah...")
-    summary_data = []
-    
-    # Pastikan nama kolom 'Provinsi' dan 'Brand' sesuai dengan di Excel
-    for provinsi, group in df.groupby('Provinsi'):
-        # A. Hitung Dominasi (iPhone vs Android)
-        iphone_count = len(group[group['Brand'].str.contains('Iphone|Apple', case=False, na=False)])
-        android_count = len(group) - iphone_count
-        
-        if iphone_count > android_count:
-            dominasi = "🍏 Dominan iPhone"
-            color_code = "#ff4d4d" # Merah
-        else:
-            dominasi = "🤖 Dominan Android"
-            color_code = "#7bed9f" # Hijau
-            
-        # B. Cari Top 3 HP
-        top_brands = group['Brand'].value_counts().head(3).index.tolist()
-        
-        hp_stats = []
-        for i in range(3):
-            if i < len(top_brands):
-                brand = top_brands[i]
-                avg_price = group[group['Brand'] == brand]['Harga_Int'].mean()
-                hp_stats.append(f"{brand} ({format_rupiah(avg_price)})")
-            else:
-                hp_stats.append("-")
-        
-        summary_data.append({
-            'Provinsi': provinsi,
-            'Dominant_Label': dominasi,
-            'Color': color_code,
-            'HP_1': hp_stats[0],
-            'HP_2': hp_stats[1],
-            'HP_3': hp_stats[2],
-            'Total_Listing': len(group)
-        })
-
-    df_summary = pd.DataFrame(summary_data)
-
-    # 5. Mapping Nama (Excel -> GADM JSON)
-    # Sesuaikan dengan nama provinsi di Excel kamu dan di JSON GADM
-    gadm_map = {
-        "DKI Jakarta": "JakartaRaya",
-        "DI Yogyakarta": "Yogyakarta",
-        "Jawa Barat": "JawaBarat",
-        "Jawa Tengah": "JawaTengah",
-        "Jawa Timur": "JawaTimur",
-        "Banten": "Banten"
-    }
-
-    # 6. Injeksi Data ke GeoJSON
+    # 6. Injeksi Data ke GeoJSON (lookup dictionary nama ternormalisasi, bukan loop bersarang)
     print("💉 Menyuntikkan data ke peta...")
+    summary_lookup = {
+        normalize_name(gadm_map.get(row['Provinsi'], row['Provinsi'])): row
+        for row in df_summary.to_dict('records')
+    }
+    region_stats = {}
     for feature in indo_geojson['features']:
         geo_name = feature['properties'].get('NAME_1', '')
+        row = summary_lookup.get(normalize_name(geo_name))
         
-        found = False
-        for index, row in df_summary.iterrows():
-            csv_name = row['Provinsi']
-            # Cek mapping, jika tidak ada di map, pakai nama asli
-            target_geo_name = gadm_map.get(csv_name, csv_name)
-            
-            # Pencocokan nama (Case Insensitive & Hapus Spasi jika perlu)
-            if target_geo_name.lower().replace(" ", "") == geo_name.lower().replace(" ", ""):
-                feature['properties']['info_wilayah'] = csv_name
-                feature['properties']['info_dominan'] = row['Dominant_Label']
-                feature['properties']['info_hp1'] = row['HP_1']
-                feature['properties']['info_hp2'] = row['HP_2']
-                feature['properties']['info_hp3'] = row['HP_3']
-                feature['properties']['style_color'] = row['Color']
-                found = True
-                break
-        
-        if not found:
-            feature['properties']['info_wilayah'] = geo_name
-            feature['properties']['info_dominan'] = "Tidak Ada Data"
-            feature['properties']['info_hp1'] = "-"
-            feature['properties']['info_hp2'] = "-"
-            feature['properties']['info_hp3'] = "-"
-            feature['properties']['style_color'] = "#d1ccc0" # Abu-abu
+        if row is not None:
+            region_stats[geo_name] = {
+                'info_wilayah': row['Provinsi'],
+                'info_dominan': row['Dominant_Label'],
+                'info_hp1': row['HP_1'],
+                'info_hp2': row['HP_2'],
+                'info_hp3': row['HP_3'],
+                'style_color': row['Color']
+            }
+        else:
+            region_stats[geo_name] = {
+                'info_wilayah': geo_name,
+                'info_dominan': "Tidak Ada Data",
+                'info_hp1': "-",
+                'info_hp2': "-",
+                'info_hp3': "-",
+                'style_color': web_map.WARNA_TANPA_DATA # Abu-abu
+            }
+        feature['properties'].update(region_stats[geo_name])
+
+    # Payload terpisah untuk app (geometri statis ber-hash + statistik kecil)
+    web_map.publish(geometry_path, region_stats)
+    sw.lap('injeksi')
+    print(f"   ✅ Payload app: {web_map.STATS_FILENAME} + static/{web_map.GEO_SUBDIR}/{os.path.basename(geometry_path)}")
 
     # 7. Render Peta
     print("🗺️  Membuat file HTML...")
+    import folium  # Import berat (~0.3 detik), hanya dibutuhkan jika peta memang dibangun ulang
     m = folium.Map(location=[-7.6145, 110.7122], zoom_start=7)
 
     def style_function(feature):
         return {
-            'fillColor': feature['properties'].get('style_color', '#d1ccc0'),
+            'fillColor': feature['properties'].get('style_color', web_map.WARNA_TANPA_DATA),
             'color': 'black',
             'weight': 1,
             'fillOpacity': 0.6
@@ -154,8 +207,15 @@ def create_gis_map():
     ).add_to(m)
 
     m.save(OUTPUT_MAP_PATH)
+    save_state({'summary_hash': input_hash})
+    sw.lap('render')
+    metrik.update(status='dibangun', ukuran_html=metrics.file_size(OUTPUT_MAP_PATH),
+                  ukuran_stats=metrics.file_size(web_map.STATS_PATH), ukuran_geometri=metrics.file_size(geometry_path))
     print(f"🎉 SUKSES! Peta tersimpan di: {OUTPUT_MAP_PATH}")
     print("👉 Buka folder 'data' dan cari file html tersebut.")
 
 if __name__ == "__main__":
-    create_gis_map()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Bangun peta GIS dari dataset hasil processing")
+    parser.add_argument("--force", action="store_true", help="Bangun ulang peta walau ringkasan wilayah tidak berubah")
+    args = parser.parse_args()
+    create_gis_map(force=args.force)
\ No newline at end of file
@@ -0,0 +1,115 @@
+import os
+import json
+import glob
+import shutil
+from string import Template
+
+# --- KONFIGURASI ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')            # Disajikan Streamlit di /app/static/ (server.enableStaticServing)
+GEO_SUBDIR = 'geo'
+STATIC_URL_PREFIX = 'app/static/'
+STATS_FILENAME = 'peta_stats.json'                       # Statistik per wilayah (kecil, berubah tiap dataset baru)
+STATS_PATH = os.path.join(BASE_DIR, 'data', STATS_FILENAME)
+
+MAP_CENTER = [-7.6145, 110.7122]
+MAP_ZOOM = 7
+WARNA_TANPA_DATA = "#d1ccc0"
+
+# Template peta ringan: geometri di-fetch dari URL ber-hash (di-cache browser),
+# statistik di-inline karena ukurannya cuma beberapa KB
+MAP_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<style>
+  html, body, #map { width: 100%; height: 100%; margin: 0; padding: 0; }
+  .leaflet-tooltip table { border-collapse: collapse; }
+  .leaflet-tooltip th { text-align: left; padding-right: 6px; }
+</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+  const STATS = $stats;
+  const GEO_URL = new URL($geo_url, document.baseURI).href;
+  const FIELDS = [['info_wilayah', '📍 Wilayah:'], ['info_dominan', '🏆 Status:'],
+                  ['info_hp1', '🥇 #1:'], ['info_hp2', '🥈 #2:'], ['info_hp3', '🥉 #3:']];
+
+  function esc(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+  }
+
+  function regionStats(feature) {
+    const name = feature.properties.NAME_1 || '';
+    return STATS[name] || {info_wilayah: name, info_dominan: 'Tidak Ada Data', info_hp1: '-',
+                           info_hp2: '-', info_hp3: '-', style_color: $warna_kosong};
+  }
+
+  const map = L.map('map').setView($center, $zoom);
+  L.tileLayer('https://tile.openstreetmap.org/{z}/{x}/{y}.png', {
+    maxZoom: 19,
+    attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+  }).addTo(map);
+
+  fetch(GEO_URL).then(resp => resp.json()).then(geo => {
+    L.geoJSON(geo, {
+      style: feature => ({fillColor: regionStats(feature).style_color, color: 'black', weight: 1, fillOpacity: 0.6}),
+      onEachFeature: (feature, layer) => {
+        const info = regionStats(feature);
+        const rows = FIELDS.map(([key, label]) => '<tr><th>' + label + '</th><td>' + esc(info[key]) + '</td></tr>');
+        layer.bindTooltip('<table>' + rows.join('') + '</table>', {sticky: true});
+      }
+    }).addTo(map);
+  });
+</script>
+</body>
+</html>
+""")
+
+def publish(geometry_path, region_stats, stats_path=STATS_PATH, static_dir=STATIC_DIR):
+    """
+    Simpan payload peta terpisah: geometri -> static/geo/ (nama file = hash konten, aman di-cache
+    browser selamanya), statistik per wilayah -> data/peta_stats.json.
+    """
+    geo_dir = os.path.join(static_dir, GEO_SUBDIR)
+    os.makedirs(geo_dir, exist_ok=True)
+    geo_name = os.path.basename(geometry_path)
+    target = os.path.join(geo_dir, geo_name)
+    if not os.path.exists(target):
+        shutil.copyfile(geometry_path, target)
+
+    # Hapus versi geometri lama agar folder static tidak menumpuk
+    for old in glob.glob(os.path.join(geo_dir, 'geometry_*.json')):
+        if os.path.basename(old) != geo_name:
+            os.remove(old)
+
+    payload = {'geometry': f"{GEO_SUBDIR}/{geo_name}", 'regions': region_stats}
+    tmp_path = stats_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, stats_path)
+    return target
+
+def render_from_stats(stats_path=STATS_PATH, static_dir=STATIC_DIR):
+    """HTML peta ringan dari peta_stats.json. Return None jika payload/geometri belum ada"""
+    if not os.path.exists(stats_path):
+        return None
+    with open(stats_path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    if not os.path.exists(os.path.join(static_dir, payload['geometry'])):
+        return None
+
+    # "</" di-escape agar string JSON tidak bisa menutup tag <script>
+    stats_js = json.dumps(payload['regions'], ensure_ascii=False).replace('</', '<\\/')
+    return MAP_TEMPLATE.substitute(
+        stats=stats_js,
+        geo_url=json.dumps(STATIC_URL_PREFIX + payload['geometry']),
+        center=json.dumps(MAP_CENTER),
+        zoom=MAP_ZOOM,
+        warna_kosong=json.dumps(WARNA_TANPA_DATA),
+    )
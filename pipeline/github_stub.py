@@ -0,0 +1,163 @@
+import re
+import json
+import base64
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# --- STUB SERVER GITHUB ---
+# Git Data API minimal (in-memory) agar pipeline/publish.py bisa diuji tanpa internet:
+#   python pipeline/github_stub.py --port 8767
+#   GITHUB_TOKEN=x python pipeline/publish.py --api-url http://127.0.0.1:8767
+# (Port default 8767 agar bisa jalan bersamaan dengan stub OLX 8765 & fairprice.py 8766)
+# Endpoint: git/refs, git/commits, git/trees, git/blobs (repo & branch apa saja).
+
+PORT = 8767
+
+ROUTE_RE = re.compile(r"^/repos/([^/]+/[^/]+)/git/(refs|ref|commits|trees|blobs)(?:/(.+))?$")
+
+def _sha(kind, payload):
+    return hashlib.sha1(f"{kind} ".encode() + payload).hexdigest()
+
+class GitStore:
+    """Objek git (blob, tree, commit, ref) dalam memori. Tree disimpan flat {path: sha_blob}."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.blobs, self.trees, self.commits, self.refs = {}, {}, {}, {}
+        self.requests = []  # Log (method, path) untuk menghitung jumlah request
+        empty_tree = self.put_tree({})
+        self.root_commit = self.put_commit("Initial commit", empty_tree, [])
+
+    def put_blob(self, content):
+        sha = hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+        self.blobs[sha] = content
+        return sha
+
+    def put_tree(self, entries):
+        sha = _sha("tree", json.dumps(entries, sort_keys=True).encode())
+        self.trees[sha] = entries
+        return sha
+
+    def put_commit(self, message, tree, parents):
+        sha = _sha("commit", json.dumps([message, tree, parents]).encode())
+        self.commits[sha] = {'message': message, 'tree': tree, 'parents': parents}
+        return sha
+
+    def ref(self, name):
+        return self.refs.setdefault(name, self.root_commit)
+
+    def files(self, ref_name="heads/main"):
+        """{path: bytes} isi branch saat ini (untuk pengecekan)"""
+        tree = self.trees[self.commits[self.ref(ref_name)]['tree']]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+def make_handler(store):
+    class GitHubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, seperti api.github.com
+        disable_nagle_algorithm = True
+
+        def _send(self, status, data):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def _handle(self, method):
+            path = self.path.split("?", 1)[0]
+            match = ROUTE_RE.match(path)
+            if not match:
+                self._send(404, {'message': "Not Found"})
+                return
+            repo, kind, arg = match.groups()
+            base = f"http://{self.headers.get('Host')}/repos/{repo}/git"
+            body = self._read_body() if method in ("POST", "PATCH") else {}
+
+            with store.lock:
+                store.requests.append((method, path))
+                status, data = self._route(method, kind, arg, body, base)
+            self._send(status, data)
+
+        def _route(self, method, kind, arg, body, base):
+            if kind in ("refs", "ref") and arg:
+                if method == "PATCH":
+                    if body.get('sha') not in store.commits:
+                        return 422, {'message': "Object does not exist"}
+                    store.refs[arg] = body['sha']
+                sha = store.ref(arg)
+                return 200, {'ref': f"refs/{arg}", 'url': f"{base}/refs/{arg}",
+                             'object': {'sha': sha, 'type': 'commit', 'url': f"{base}/commits/{sha}"}}
+
+            if kind == "blobs" and method == "POST":
+                content = body['content']
+                content = base64.b64decode(content) if body.get('encoding') == 'base64' else content.encode()
+                sha = store.put_blob(content)
+                return 201, {'sha': sha, 'url': f"{base}/blobs/{sha}"}
+
+            if kind == "trees" and method == "POST":
+                entries = dict(store.trees.get(body.get('base_tree'), {}))
+                for e in body['tree']:
+                    if e.get('sha') is None:
+                        entries.pop(e['path'], None)
+                    else:
+                        entries[e['path']] = e['sha']
+                sha = store.put_tree(entries)
+                return 201, self._tree_json(sha, base)
+
+            if kind == "trees" and arg in store.trees:
+                return 200, self._tree_json(arg, base)
+
+            if kind == "commits" and method == "POST":
+                sha = store.put_commit(body['message'], body['tree'], body.get('parents', []))
+                return 201, self._commit_json(sha, base)
+
+            if kind == "commits" and arg in store.commits:
+                return 200, self._commit_json(arg, base)
+
+            return 404, {'message': "Not Found"}
+
+        def _tree_json(self, sha, base):
+            tree = [{'path': p, 'mode': '100644', 'type': 'blob', 'sha': s, 'size': len(store.blobs.get(s, b''))}
+                    for p, s in sorted(store.trees[sha].items())]
+            return {'sha': sha, 'url': f"{base}/trees/{sha}", 'tree': tree, 'truncated': False}
+
+        def _commit_json(self, sha, base):
+            c = store.commits[sha]
+            return {'sha': sha, 'url': f"{base}/commits/{sha}", 'message': c['message'],
+                    'tree': {'sha': c['tree'], 'url': f"{base}/trees/{c['tree']}"},
+                    'parents': [{'sha': p, 'url': f"{base}/commits/{p}"} for p in c['parents']]}
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PATCH(self):
+            self._handle("PATCH")
+
+        def log_message(self, format, *args):
+            pass  # Jangan banjiri terminal
+
+    return GitHubHandler
+
+def serve(host="127.0.0.1", port=PORT, store=None):
+    store = store or GitStore()
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    server.store = store
+    print(f"🧪 Stub GitHub aktif di http://{host}:{server.server_address[1]}")
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub server Git Data API GitHub (in-memory)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT, help="0 = pilih port kosong otomatis")
+    args = parser.parse_args()
+    serve(args.host, args.port).serve_forever()
@@ -0,0 +1,71 @@
+import os
+import logging
+from logging.handlers import RotatingFileHandler
+
+# --- KONFIGURASI LOG ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(BASE_DIR, 'data', 'logs')
+LOG_MAX_BYTES = 2 * 1024 * 1024   # Rotasi per 2 MB
+LOG_BACKUP = 3                    # Simpan <job_id>.log.1 .. .3
+JOB_LOG_DIR = os.path.join(LOG_DIR, 'jobs')  # 1 file log per job: jobs/<job_id>.log
+JOB_LOG_SIMPAN = 10                          # Log N job terakhir yang disimpan
+
+MAX_BARIS_UI = 300       # Hanya N baris terakhir log yang dikirim ke browser
+
+def get_file_logger(path):
+    """Logger file berotasi (1 handler per path, aman dipanggil berulang kali)"""
+    logger = logging.getLogger(f"fairprice.pipeline.{path}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def job_log_path(job_id):
+    """File log khusus 1 job (UI tidak tercampur sisa log job sebelumnya)"""
+    return os.path.join(JOB_LOG_DIR, f"{job_id}.log")
+
+def prune_job_logs(keep=JOB_LOG_SIMPAN):
+    """Hapus log job lama. job_id diawali timestamp, jadi urutan nama = urutan waktu."""
+    if not os.path.isdir(JOB_LOG_DIR):
+        return
+    per_job = {}
+    for name in os.listdir(JOB_LOG_DIR):
+        per_job.setdefault(name.split('.log', 1)[0], []).append(name)  # <id>.log, <id>.log.1, ...
+    for job_id in sorted(per_job)[:max(len(per_job) - keep, 0)]:
+        for name in per_job[job_id]:
+            try:
+                os.remove(os.path.join(JOB_LOG_DIR, name))
+            except OSError:
+                pass
+
+class LogStream:
+    """
+    Log output script ke file berotasi. UI tidak membaca objek ini: panel job membaca
+    N baris terakhir file lewat tail_lines(), jadi biaya update UI konstan berapa pun panjang run-nya.
+    """
+
+    def __init__(self, log_path):
+        self.logger = get_file_logger(log_path)
+
+    def write(self, line):
+        self.logger.info(line.rstrip('\n'))
+
+def tail_lines(path, n=MAX_BARIS_UI, block=64 * 1024):
+    """N baris terakhir file log (dibaca dari belakang, tanpa timestamp) untuk ditampilkan di UI"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        data = b''
+        while end > 0 and data.count(b'\n') <= n:
+            start = max(0, end - block)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    lines = data.decode('utf-8', errors='replace').splitlines()[-n:]
+    return [line.split(' | ', 1)[-1] for line in lines]
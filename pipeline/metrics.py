@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import uuid
+
+from pipeline import logs
+
+# --- KONFIGURASI METRIK ---
+METRICS_PATH = os.path.join(logs.LOG_DIR, 'metrics.jsonl')  # 1 baris JSON per event
+MAX_BYTES = 5 * 1024 * 1024   # Lebih dari ini -> file lama digeser ke metrics.jsonl.1
+ENV_RUN_ID = 'PIPELINE_RUN_ID'  # Diisi runner agar semua tahap dalam 1 job punya run_id yang sama
+
+TAHAP = ('scraper', 'processing', 'peta', 'publish')
+
+def run_id():
+    """Id run saat ini. Dibuat sekali per proses & disimpan di env agar diwarisi worker process."""
+    rid = os.environ.get(ENV_RUN_ID)
+    if not rid:
+        rid = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        os.environ[ENV_RUN_ID] = rid
+    return rid
+
+def _json_default(obj):
+    # Angka numpy (int64/float64) -> tipe Python biasa
+    return obj.item() if hasattr(obj, 'item') else str(obj)
+
+def emit(tahap, event, path=METRICS_PATH, **fields):
+    """Tulis 1 event metrik (append 1 baris, aman dipanggil dari beberapa proses sekaligus)"""
+    record = {'waktu': round(time.time(), 3), 'run_id': run_id(), 'tahap': tahap, 'event': event, **fields}
+    line = json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > MAX_BYTES:
+            os.replace(path, path + '.1')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+    except OSError as e:
+        # Metrik tidak boleh menggagalkan pipeline
+        print(f"⚠️ Gagal menulis metrik: {e}")
+    return record
+
+class Stopwatch:
+    """Durasi beberapa langkah berurutan: sw.lap('baca_csv'), ... -> sw.laps"""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.laps = {}
+
+    def lap(self, nama):
+        now = time.perf_counter()
+        self.laps[nama] = round(self.laps.get(nama, 0) + now - self.last, 3)
+        self.last = now
+
+    def total(self):
+        return round(time.perf_counter() - self.start, 3)
+
+class Timer:
+    """
+    Context manager: 1 event berisi durasi blok + field yang diisi selama blok berjalan.
+        with metrics.Timer('peta', 'selesai') as m:
+            m['status'] = 'dibangun'
+    """
+
+    def __init__(self, tahap, event, **fields):
+        self.tahap, self.event, self.fields = tahap, event, fields
+        self.stopwatch = Stopwatch()
+
+    def __enter__(self):
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fields['durasi'] = self.stopwatch.total()
+        self.fields['sukses'] = exc_type is None
+        if exc is not None:
+            self.fields['error'] = str(exc)
+        emit(self.tahap, self.event, **self.fields)
+        return False
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+def read_records(path=METRICS_PATH):
+    """Semua event di file metrik (baris rusak dilewati)"""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+def summarize_runs(records, n=5):
+    """
+    Ringkasan n run terakhir (terbaru dulu): durasi per tahap, total, status & semua event-nya.
+    Durasi tahap diambil dari event 'selesai' tahap itu sendiri; tahap tanpa event sendiri
+    (mis. publish) memakai durasi langkah dari runner.
+    """
+    runs = {}
+    for r in records:
+        run = runs.setdefault(r['run_id'], {
+            'run_id': r['run_id'], 'mulai': r['waktu'], 'durasi': {}, 'total': None,
+            'status': None, 'events': [],
+        })
+        run['mulai'] = min(run['mulai'], r['waktu'])
+        run['events'].append(r)
+        if r['tahap'] == 'pipeline':
+            if r['event'] == 'langkah':
+                run['durasi'].setdefault(r['nama'].lower(), r.get('durasi'))
+            elif r['event'] == 'selesai':
+                run['total'], run['status'] = r.get('durasi'), r.get('status')
+        elif r['event'] == 'selesai':
+            run['durasi'][r['tahap']] = r.get('durasi')
+
+    hasil = sorted(runs.values(), key=lambda run: run['mulai'], reverse=True)[:n]
+    for run in hasil:
+        if run['total'] is None:
+            run['total'] = round(sum(d for d in run['durasi'].values() if d), 3)
+    return hasil
+
+def stage_event(run, tahap, event='selesai'):
+    """Event terakhir `tahap`/`event` dalam 1 run (atau {} jika tidak ada)"""
+    found = [r for r in run['events'] if r['tahap'] == tahap and r['event'] == event]
+    return found[-1] if found else {}
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import base64
+import hashlib
+import argparse
+
+# Agar modul di folder 'processing' & 'gis' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import dataset, cube
+from gis import web_map
+
+# --- KONFIGURASI GITHUB ---
+# PASTIKAN INI BENAR (Huruf besar/kecil berpengaruh)
+# Format: "UsernameGithub/NamaRepository"
+REPO_NAME = "kakamr/FairPrice-Map"
+BRANCH = "main"
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")  # Bisa diarahkan ke pipeline/github_stub.py
+
+# Hash blob (format git) per file yang terakhir berhasil dipublish
+STATE_PATH = os.path.join(BASE_DIR, 'data', 'publish_state.json')
+
+# Artefak yang dipublish bersama dalam 1 commit (path relatif root repo = path di GitHub)
+ARTIFACTS = [
+    f"data/{dataset.DATASET_FILENAME}",
+    f"data/{cube.CUBE_FILENAME}",
+    "data/peta_gadget_jawa.html",
+    f"data/{web_map.STATS_FILENAME}",
+]
+# Geometri ber-hash: versi lama dihapus lokal oleh web_map.publish -> ikut dihapus di remote
+GEO_PREFIX = f"static/{web_map.GEO_SUBDIR}/"
+
+def blob_sha(content):
+    """SHA blob versi git: sama dengan sha yang dilaporkan GitHub untuk file tsb"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def artifact_paths():
+    """ARTIFACTS + file geometri yang sedang dipakai peta_stats.json (static/geo/...)"""
+    paths = list(ARTIFACTS)
+    try:
+        with open(web_map.STATS_PATH, 'r', encoding='utf-8') as f:
+            paths.append(f"static/{json.load(f)['geometry']}")
+    except (OSError, ValueError, KeyError):
+        pass
+    return paths
+
+def local_artifacts(paths):
+    """{path_repo: (path_lokal, sha)} untuk artefak yang ada di disk"""
+    files = {}
+    for repo_path in paths:
+        local_path = os.path.join(BASE_DIR, *repo_path.split('/'))
+        if not os.path.exists(local_path):
+            print(f"   ⚠️ Lewati (tidak ada): {repo_path}")
+            continue
+        with open(local_path, 'rb') as f:
+            files[repo_path] = (local_path, blob_sha(f.read()))
+    return files
+
+def stale_geometry(candidates, files):
+    """Path geometri lama (bukan yang sedang dipakai). Kosong jika geometri aktif tidak diketahui."""
+    if not any(p.startswith(GEO_PREFIX) for p in files):
+        return set()
+    return {p for p in candidates if p.startswith(GEO_PREFIX) and p not in files}
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def get_token():
+    """Token dari env GITHUB_TOKEN, fallback ke .streamlit/secrets.toml ([github] token)"""
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    try:
+        import streamlit as st
+        return st.secrets["github"]["token"]
+    except Exception:
+        return None
+
+def publish(paths=None, repo_name=REPO_NAME, branch=BRANCH, api_url=API_URL, token=None, force=False,
+            state_path=STATE_PATH):
+    """
+    Publish artefak yang berubah dalam 1 commit lewat Git Data API (blob -> tree -> commit -> ref).
+    Artefak dengan hash sama seperti publish terakhir (atau sama dengan isi remote) tidak di-upload.
+    Return sha commit baru, atau None jika tidak ada yang perlu di-commit.
+    """
+    files = local_artifacts(paths if paths is not None else artifact_paths())
+    state = {} if force else load_state(state_path)
+    changed = {p: v for p, v in files.items() if state.get(p) != v[1]}
+    if not changed and not stale_geometry(state, files):
+        print("⏭️ Semua artefak sama dengan publish terakhir. Skip upload.")
+        return None
+
+    token = token or get_token()
+    if not token:
+        print("⚠️ Token GitHub tidak ditemukan (env GITHUB_TOKEN / secrets [github] token). Skip upload.")
+        return None
+
+    from github import Github, Auth, InputGitTreeElement
+
+    # 1 client (1 session HTTP keep-alive) untuk semua request
+    g = Github(auth=Auth.Token(token), base_url=api_url, lazy=True)  # lazy: tanpa GET repo terpisah
+    try:
+        repo = g.get_repo(repo_name)
+        ref = repo.get_git_ref(f"heads/{branch}")
+        head = repo.get_git_commit(ref.object.sha)
+        print(f"🔍 {repo_name}@{branch}: {head.sha[:7]}")
+
+        # Blob yang isinya sudah identik di remote tidak perlu dikirim ulang
+        remote = {e.path: e.sha for e in repo.get_git_tree(head.tree.sha, recursive=True).tree if e.type == 'blob'}
+        upload = {p: v for p, v in changed.items() if remote.get(p) != v[1]}
+        deleted = sorted(stale_geometry(remote, files))
+
+        commit_sha = None
+        if upload or deleted:
+            elements = []
+            for repo_path, (local_path, sha) in sorted(upload.items()):
+                with open(local_path, 'rb') as f:
+                    content = base64.b64encode(f.read()).decode('ascii')
+                blob = repo.create_git_blob(content, 'base64')
+                if blob.sha != sha:
+                    raise RuntimeError(f"SHA blob {repo_path} tidak cocok ({blob.sha} != {sha})")
+                elements.append(InputGitTreeElement(repo_path, '100644', 'blob', sha=blob.sha))
+                print(f"   📤 {repo_path} ({os.path.getsize(local_path) / 1024:.0f} KB)")
+            for repo_path in deleted:
+                # sha=None di tree baru = hapus file dari base_tree
+                elements.append(InputGitTreeElement(repo_path, '100644', 'blob', sha=None))
+                print(f"   🗑️ {repo_path} (geometri lama)")
+
+            tree = repo.create_git_tree(elements, base_tree=head.tree)
+            names = ", ".join(os.path.basename(p) for p in sorted(upload))
+            if deleted:
+                names += f"{', ' if names else ''}hapus {len(deleted)} geometri lama"
+            commit = repo.create_git_commit(f"Auto-update: {names}", tree, [head])
+            ref.edit(commit.sha)
+            commit_sha = commit.sha
+            print(f"✅ GitHub: {len(upload)} file di-commit & {len(deleted)} dihapus sekaligus ({commit_sha[:7]}).")
+        else:
+            print("⏭️ Isi remote sudah sama. Tidak ada commit baru.")
+    finally:
+        g.close()
+
+    # State hanya diperbarui setelah ref berhasil dipindah
+    for repo_path in stale_geometry(state, files):
+        del state[repo_path]
+    state.update({p: v[1] for p, v in files.items()})
+    save_state(state, state_path)
+    return commit_sha
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish dataset, agregat & peta ke GitHub (1 commit)")
+    parser.add_argument("--repo", default=REPO_NAME)
+    parser.add_argument("--branch", default=BRANCH)
+    parser.add_argument("--api-url", default=API_URL, help="Base URL API GitHub (mis. stub lokal)")
+    parser.add_argument("--force", action="store_true", help="Abaikan state hash lokal (tetap dibandingkan dengan remote)")
+    args = parser.parse_args()
+
+    print("☁️ Publish artefak ke GitHub...")
+    try:
+        publish(repo_name=args.repo, branch=args.branch, api_url=args.api_url, force=args.force)
+    except Exception as e:
+        print(f"❌ Gagal Push ke GitHub: {e}")
+        print("💡 Tips: Cek 'repo' permission di GitHub Token Anda & pastikan nama REPO_NAME benar.")
+        sys.exit(1)
@@ -0,0 +1,253 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import contextlib
+import threading
+import subprocess
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# Agar modul di folder 'pipeline' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from pipeline import logs, metrics
+
+# --- KONFIGURASI JOB ---
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+LOCK_PATH = os.path.join(DATA_DIR, 'pipeline.lock')       # Dikunci OS selama pipeline jalan (single-flight)
+JOB_STATE_PATH = os.path.join(DATA_DIR, 'pipeline_job.json')
+ENV_LOCK = 'PIPELINE_LOCK_HELD'  # Diisi run_job: script langkah sudah berjalan di bawah pipeline.lock
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", "2"))  # Browser paralel saat update dari app
+
+# (nama langkah, script, wajib sukses?). Langkah tidak wajib boleh gagal tanpa membatalkan job.
+STEPS = [
+    ("Scraper", os.path.join('scraper', 'scraper_olx.py'), True),
+    ("Processing", os.path.join('processing', 'processed_final_data.py'), True),
+    ("Peta", os.path.join('gis', 'map.py'), False),
+    ("Publish", os.path.join('pipeline', 'publish.py'), False),  # 1 commit GitHub, skip jika artefak tidak berubah
+]
+
+# Argumen tambahan per langkah
+STEP_ARGS = {"Scraper": ["--workers", str(SCRAPER_WORKERS)]}
+
+STATUS_JALAN = "berjalan"
+STATUS_SUKSES = "sukses"
+STATUS_GAGAL = "gagal"
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+# --- LOCK (SINGLE-FLIGHT) ---
+# Kunci OS (flock / msvcrt) pada pipeline.lock, dipegang proses job selama berjalan.
+# Kunci lepas otomatis saat proses selesai/crash/dibunuh, jadi tidak ada lock basi yang perlu diambil alih
+# (pengambilalihan lock basi berbasis pid rawan race: 2 proses bisa sama-sama menganggapnya basi).
+def _try_lock(fd):
+    """Kunci eksklusif tanpa menunggu. Return False jika sedang dipegang proses lain."""
+    try:
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+def acquire_lock(retry=3):
+    """
+    Buka & kunci pipeline.lock. Return fd (kunci bertahan selama fd terbuka), atau None jika
+    pipeline lain berjalan. Dicoba beberapa kali karena is_running() sesaat ikut memegang kunci.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    fd = os.open(LOCK_PATH, os.O_CREAT | os.O_RDWR)
+    for i in range(retry):
+        if _try_lock(fd):
+            return fd
+        time.sleep(0.05 * (i + 1))
+    os.close(fd)
+    return None
+
+def release_lock(fd):
+    # File lock tidak dihapus: menghapusnya membuat proses lain bisa mengunci inode yang berbeda
+    os.close(fd)
+
+def is_running():
+    """True jika ada proses yang sedang memegang kunci pipeline.lock"""
+    try:
+        fd = os.open(LOCK_PATH, os.O_RDWR)
+    except FileNotFoundError:
+        return False
+    try:
+        return not _try_lock(fd)
+    finally:
+        os.close(fd)  # Sekaligus melepas kunci jika tadi berhasil diambil
+
+@contextlib.contextmanager
+def hold_lock(timeout=30 * 60):
+    """
+    Jalankan blok di bawah pipeline.lock (menunggu job lain selesai, maksimal `timeout` detik).
+    Di dalam job runner lock sudah dipegang proses job, jadi langsung jalan.
+    """
+    if os.environ.get(ENV_LOCK) == "1":
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    fd = acquire_lock()
+    while fd is None:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Pipeline lain masih berjalan (pipeline.lock).")
+        time.sleep(1)
+        fd = acquire_lock()
+    try:
+        yield
+    finally:
+        release_lock(fd)
+
+# --- STATE JOB ---
+def read_job():
+    """State job terakhir (berjalan atau sudah selesai). Job 'berjalan' tanpa proses hidup = gagal/crash."""
+    job = _read_json(JOB_STATE_PATH)
+    if job and job.get('status') == STATUS_JALAN and not is_running():
+        job['status'] = STATUS_GAGAL
+        job['pesan'] = "Proses pipeline berhenti tanpa menyelesaikan job (crash/dimatikan)."
+    return job
+
+def _save_job(job):
+    job['diperbarui'] = time.time()
+    _write_json(JOB_STATE_PATH, job)
+
+def start_job():
+    """
+    Jalankan pipeline di proses terpisah (lepas dari script run Streamlit).
+    Return job_id, atau None jika pipeline lain masih berjalan.
+    """
+    job_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+    lock_fd = acquire_lock()
+    if lock_fd is None:
+        return None
+
+    _save_job({
+        'job_id': job_id, 'status': STATUS_JALAN, 'langkah': 0, 'total_langkah': len(STEPS),
+        'nama_langkah': None, 'mulai': time.time(), 'selesai': None, 'pesan': "Menunggu proses pipeline...",
+        'hasil_langkah': [],
+    })
+
+    command = [sys.executable, os.path.abspath(__file__), "run", "--job-id", job_id]
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+        # Kunci msvcrt tidak bisa diwariskan: dilepas di sini, proses job menguncinya sendiri
+        release_lock(lock_fd)
+    else:
+        kwargs['start_new_session'] = True  # Tidak ikut mati saat server Streamlit restart
+        kwargs['pass_fds'] = (lock_fd,)     # Proses job mewarisi fd -> kunci tetap dipegang tanpa jeda
+        command += ["--lock-fd", str(lock_fd)]
+
+    try:
+        process = subprocess.Popen(
+            command, cwd=BASE_DIR, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            **kwargs
+        )
+    finally:
+        if os.name != 'nt':
+            release_lock(lock_fd)  # Salinan fd milik proses ini saja; kunci tetap dipegang proses job
+    # Reap proses anak saat selesai agar tidak jadi zombie
+    threading.Thread(target=process.wait, daemon=True).start()
+    return job_id
+
+def run_step(script_path, log_stream, args=()):
+    """Jalankan 1 script, semua output ke log berotasi. Return exit code."""
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+    env["PYTHONUNBUFFERED"] = "1"
+    env[ENV_LOCK] = "1"
+    process = subprocess.Popen(
+        [sys.executable, script_path, *args],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+        encoding='utf-8', errors='replace', env=env, cwd=BASE_DIR
+    )
+    for line in process.stdout:
+        log_stream.write(line)
+    return process.wait()
+
+def run_job(job_id, lock_fd=None):
+    """Isi proses background: Scraper -> Processing -> Peta -> Publish, state diperbarui tiap langkah"""
+    if lock_fd is None:
+        lock_fd = acquire_lock()
+        if lock_fd is None:
+            print(f"⏳ [JOB {job_id}] Pipeline lain masih berjalan. Job dibatalkan.")
+            return
+    job = _read_json(JOB_STATE_PATH) or {'job_id': job_id, 'hasil_langkah': []}
+    os.environ[metrics.ENV_RUN_ID] = job_id  # Metrik semua langkah (diwarisi script anak) tercatat di 1 run_id
+    logs.prune_job_logs(keep=logs.JOB_LOG_SIMPAN - 1)
+    log_stream = logs.LogStream(logs.job_log_path(job_id))
+    log_stream.write(f"🧵 [JOB {job_id}] Pipeline dimulai (pid {os.getpid()}).")
+    job.update({'status': STATUS_JALAN, 'pid': os.getpid(), 'pesan': None})
+
+    try:
+        for i, (nama, script, wajib) in enumerate(STEPS, start=1):
+            job.update({'langkah': i, 'nama_langkah': nama, 'pesan': f"Menjalankan {nama}..."})
+            _save_job(job)
+            log_stream.write(f"🔵 [SYSTEM] Menjalankan: {script}...")
+
+            start = time.time()
+            code = run_step(script, log_stream, STEP_ARGS.get(nama, ()))
+            job['hasil_langkah'].append({'nama': nama, 'kode': code, 'durasi': round(time.time() - start, 1)})
+            metrics.emit('pipeline', 'langkah', nama=nama, kode=code, durasi=round(time.time() - start, 3))
+
+            if code == 0:
+                log_stream.write(f"✅ [SUCCESS] {script} selesai.")
+            elif wajib:
+                log_stream.write(f"❌ [ERROR] {script} gagal (Code {code}).")
+                job.update({'status': STATUS_GAGAL, 'pesan': f"{nama} gagal (Code {code}). Langkah berikutnya dibatalkan."})
+                return
+            else:
+                log_stream.write(f"⚠️ [WARNING] {script} gagal (Code {code}), hasil lama tetap dipakai.")
+
+        peringatan = [h['nama'] for h in job['hasil_langkah'] if h['kode'] != 0]
+        job.update({'status': STATUS_SUKSES,
+                    'pesan': f"Selesai, tetapi {', '.join(peringatan)} gagal." if peringatan else "Seluruh proses selesai."})
+    except Exception as e:
+        log_stream.write(f"❌ [EXCEPTION] {e}")
+        job.update({'status': STATUS_GAGAL, 'pesan': f"Exception: {e}"})
+    finally:
+        job['selesai'] = time.time()
+        _save_job(job)
+        metrics.emit('pipeline', 'selesai', status=job['status'], durasi=round(job['selesai'] - job.get('mulai', job['selesai']), 3))
+        log_stream.write(f"🏁 [JOB {job_id}] {job['status'].upper()}: {job['pesan']}")
+        release_lock(lock_fd)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runner pipeline Scraper -> Processing -> Peta -> Publish")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("start", help="Mulai pipeline di background (jika belum ada yang berjalan)")
+    sub.add_parser("status", help="Tampilkan state job terakhir")
+    p_run = sub.add_parser("run", help="(internal) Jalankan job di proses ini")
+    p_run.add_argument("--job-id", required=True)
+    p_run.add_argument("--lock-fd", type=int, help="fd pipeline.lock yang sudah dikunci proses pemanggil")
+    args = parser.parse_args()
+
+    if args.cmd == "start":
+        job_id = start_job()
+        print(f"🚀 Job {job_id} dimulai." if job_id else "⏳ Pipeline lain masih berjalan.")
+    elif args.cmd == "status":
+        print(json.dumps(read_job(), indent=2, ensure_ascii=False))
+    else:
+        run_job(args.job_id, args.lock_fd)
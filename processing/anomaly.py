@@ -0,0 +1,145 @@
+import os
+import numpy as np
+import pandas as pd
+
+from processing import dataset
+
+# --- KONFIGURASI ---
+STATE_FILENAME = 'anomali_state.npz'
+STATE_PATH = os.path.join(dataset.DATA_DIR, STATE_FILENAME)
+
+# Histogram log10(harga): Rp 10 rb - Rp 100 jt, lebar bin 0.01 (~2.3% harga)
+LOG_MIN, LOG_MAX, JUMLAH_BIN = 4.0, 8.0, 400
+LEBAR_BIN = (LOG_MAX - LOG_MIN) / JUMLAH_BIN
+BIN_CENTER = LOG_MIN + LEBAR_BIN * (np.arange(JUMLAH_BIN) + 0.5)
+
+# Grup statistik dari paling spesifik ke paling umum; grup dengan data < MIN_SAMPEL
+# memakai level berikutnya (histogram bisa dijumlahkan, jadi tidak perlu scan ulang)
+LEVEL_GRUP = [('Brand', 'Kelas_Sosial', 'Provinsi'), ('Brand', 'Kelas_Sosial'), ('Brand',)]
+MIN_SAMPEL = 10
+
+# Skor = modified z-score (Iglewicz & Hoaglin): 0.6745 * (x - median) / MAD, di skala log.
+# Negatif = lebih murah dari pasaran. |skor| > BATAS_SKOR dianggap mencurigakan.
+BATAS_SKOR = 3.5
+
+def log_harga(harga):
+    return np.log10(np.clip(np.asarray(harga, dtype=float), 1, None))
+
+def harga_to_bin(harga):
+    bins = np.floor((log_harga(harga) - LOG_MIN) / LEBAR_BIN).astype(np.int64)
+    return np.clip(bins, 0, JUMLAH_BIN - 1)
+
+def group_keys(df, cols=LEVEL_GRUP[0]):
+    """
+    Kode grup per baris + key tiap grup unik (mis. 'Samsung|Mid Range|Banten').
+    String key hanya dibentuk per grup unik, bukan per baris.
+    """
+    # Gabung kode kategori tiap kolom jadi 1 integer (kode 0 = kosong/NaN)
+    combined = np.zeros(len(df), dtype=np.int64)
+    categories = []
+    for col in cols:
+        cat = pd.Categorical(df[col])
+        categories.append(cat.categories)
+        combined = combined * (len(cat.categories) + 1) + (cat.codes.astype(np.int64) + 1)
+    codes, uniq = pd.factorize(combined)
+
+    keys, kosong = [], []
+    for value in uniq:
+        parts = []
+        for cats in reversed(categories):
+            value, code = divmod(int(value), len(cats) + 1)
+            parts.append(str(cats[code - 1]) if code else None)
+        kosong.append(None in parts)
+        keys.append('|'.join(p or '' for p in reversed(parts)))
+
+    # Baris dengan salah satu dimensi kosong -> kode -1 (tidak masuk grup mana pun)
+    codes = np.where(np.array(kosong + [True])[codes], -1, codes)
+    return codes, keys
+
+def median_mad(counts):
+    """Median & MAD (skala log) per baris histogram, vektor untuk semua grup sekaligus"""
+    n = counts.sum(axis=1)
+    half = n[:, None] / 2.0
+    med_bin = np.argmax(np.cumsum(counts, axis=1) >= half, axis=1)
+    median = BIN_CENTER[med_bin]
+
+    # MAD = median dari |x - median| -> urutkan bin berdasarkan jarak ke median
+    dev = np.abs(BIN_CENTER[None, :] - median[:, None])
+    order = np.argsort(dev, axis=1, kind='stable')
+    cum = np.cumsum(np.take_along_axis(counts, order, axis=1), axis=1)
+    idx = np.argmax(cum >= half, axis=1)
+    mad = np.take_along_axis(dev, order, axis=1)[np.arange(len(counts)), idx]
+    return median, np.maximum(mad, LEBAR_BIN)  # MAD minimal 1 bin (grup harga seragam)
+
+class AnomalyStats:
+    """Histogram harga per (Brand, Kelas_Sosial, Provinsi), bisa di-update tanpa scan ulang histori"""
+
+    def __init__(self, keys=None, counts=None):
+        self.keys = list(keys) if keys is not None else []
+        self.counts = counts if counts is not None else np.zeros((0, JUMLAH_BIN), dtype=np.int64)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        """Return None jika state belum ada"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['keys'].tolist(), data['counts'])
+
+    def save(self, path=STATE_PATH):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=np.array(self.keys, dtype=str), counts=self.counts)
+        os.replace(tmp_path, path)
+
+    def update(self, df):
+        """Tambahkan listing baru ke histogram"""
+        codes, keys = group_keys(df)
+        baru = [k for k in keys if k not in self.index]
+        for k in baru:
+            self.index[k] = len(self.keys)
+            self.keys.append(k)
+        if baru:
+            self.counts = np.vstack([self.counts, np.zeros((len(baru), JUMLAH_BIN), dtype=np.int64)])
+
+        valid = codes >= 0  # Baris dengan dimensi kosong tidak masuk statistik
+        rows = np.array([self.index[k] for k in keys], dtype=np.int64)[codes[valid]]
+        flat = rows * JUMLAH_BIN + harga_to_bin(df['Harga_Int'])[valid]
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        return self
+
+    def _level_stats(self, n_cols):
+        """Gabungkan histogram ke level n_cols kolom pertama. Return (key->posisi, n, median, mad)"""
+        prefixes = ['|'.join(k.split('|')[:n_cols]) for k in self.keys]
+        codes, uniq = pd.factorize(np.array(prefixes, dtype=object))
+        counts = np.zeros((len(uniq), JUMLAH_BIN), dtype=np.int64)
+        np.add.at(counts, codes, self.counts)
+        median, mad = median_mad(counts)
+        return {k: i for i, k in enumerate(uniq)}, counts.sum(axis=1), median, mad
+
+    def score(self, df):
+        """Skor anomali per listing (NaN jika brand belum punya statistik)"""
+        median = np.full(len(df), np.nan)
+        mad = np.full(len(df), np.nan)
+        pending = np.ones(len(df), dtype=bool)
+
+        for cols in LEVEL_GRUP:
+            if not pending.any() or not self.keys:
+                break
+            lookup, n, med_lvl, mad_lvl = self._level_stats(len(cols))
+            codes, keys = group_keys(df, cols)
+            pos = np.array([lookup.get(k, -1) for k in keys] + [-1], dtype=np.int64)[codes]
+            cukup = (pos >= 0) & (n[pos] >= MIN_SAMPEL)
+            if cols == LEVEL_GRUP[-1]:
+                cukup = pos >= 0  # Level terakhir: pakai apa adanya
+            pakai = pending & cukup
+            median[pakai] = med_lvl[pos[pakai]]
+            mad[pakai] = mad_lvl[pos[pakai]]
+            pending &= ~pakai
+
+        return np.round(0.6745 * (log_harga(df['Harga_Int']) - median) / mad, 2)
+
+def is_suspicious(skor, batas=BATAS_SKOR):
+    """Listing mencurigakan (terlalu murah/mahal dibanding grupnya)"""
+    return np.abs(np.asarray(skor, dtype=float)) > batas
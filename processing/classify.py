@@ -0,0 +1,75 @@
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# --- KONFIGURASI BRAND ---
+# Urutan list = prioritas. Jika judul memuat beberapa brand, brand yang
+# paling awal di list ini yang dipakai (sama seperti loop lama).
+BRANDS = [
+    'iphone', 'samsung', 'xiaomi', 'redmi', 'oppo', 'vivo',
+    'realme', 'infinix', 'asus', 'rog', 'google', 'pixel',
+    'poco', 'tecno', 'itel', 'sony', 'huawei', 'nokia', 'advan'
+]
+BRAND_ALIAS = {'rog': 'Asus', 'redmi': 'Xiaomi', 'pixel': 'Google'}
+DEFAULT_BRAND = 'Lainnya/Unknown'
+
+# --- KONFIGURASI KELAS HARGA ---
+# <2jt = Entry, 2jt-5jt (inklusif) = Mid, >5jt = Flagship
+BATAS_MID = 2000000
+BATAS_FLAGSHIP = 5000000
+KELAS_LABELS = ('Entry Level', 'Mid Range', 'Flagship/Sultan')
+
+def brand_pattern(brands=BRANDS):
+    """Satu regex (RE2) berisi semua brand, dipakai oleh compute Arrow"""
+    return '(?P<brand>' + '|'.join(re.escape(b) for b in brands) + ')'
+
+def _best_rank(lowered, brands):
+    """Index brand prioritas tertinggi per judul (len(brands) = tidak ada brand)"""
+    # 1x scan regex: ambil brand yang muncul paling kiri di judul
+    leftmost = pc.struct_field(pc.extract_regex(lowered, pattern=brand_pattern(brands)), [0])
+    rank = pc.fill_null(pc.index_in(leftmost, value_set=pa.array(brands)), len(brands))
+    rank = rank.to_numpy(zero_copy_only=False).astype(np.int64)
+
+    # Brand paling kiri belum tentu paling prioritas (mis. "samsung ... iphone").
+    # Cek hanya baris tsb terhadap brand yang lebih prioritas, lalu ulangi secara rekursif.
+    for r in np.unique(rank):
+        if r == 0 or r == len(brands):
+            continue
+        idx = np.flatnonzero(rank == r)
+        subset = lowered.take(pa.array(idx))
+        higher = pc.match_substring_regex(subset, pattern=brand_pattern(brands[:r]))
+        higher = higher.to_numpy(zero_copy_only=False)
+        if higher.any():
+            rank[idx[higher]] = _best_rank(subset.filter(pa.array(higher)), brands[:r])
+    return rank
+
+def extract_brand(judul, brands=BRANDS, aliases=BRAND_ALIAS, default=DEFAULT_BRAND):
+    """
+    Versi vektor dari extract_brand lama (substring, case-insensitive, prioritas urutan list).
+    Regex hanya dijalankan sekali per judul unik, lalu hasilnya disebar kembali ke semua baris.
+    Catatan: lower() memakai Arrow (Unicode-aware), jadi 'İphone' ikut terbaca sebagai 'iphone'.
+    """
+    judul = pd.Series(judul)
+    codes, uniques = pd.factorize(judul.astype(str), use_na_sentinel=False)
+    lowered = pc.utf8_lower(pa.array(uniques, type=pa.string()))
+    best = _best_rank(lowered, list(brands))
+
+    labels = [aliases.get(b, b.capitalize()) for b in brands] + [default]
+    label_idx, label_names = pd.factorize(pd.Series(labels))
+    per_unique = label_idx[best]
+    return pd.Series(
+        pd.Categorical.from_codes(per_unique[codes], categories=label_names),
+        index=judul.index,
+    )
+
+def categorize_class(harga, labels=KELAS_LABELS):
+    """Binning vektor Harga_Int: >5jt = labels[2], 2jt-5jt = labels[1], selain itu labels[0]"""
+    harga = pd.Series(harga)
+    values = harga.to_numpy()
+    codes = (values >= BATAS_MID).astype(np.int8) + (values > BATAS_FLAGSHIP)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=list(labels)),
+        index=harga.index,
+    )
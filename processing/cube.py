@@ -0,0 +1,49 @@
+import os
+import pandas as pd
+
+from processing import dataset
+
+# --- KONFIGURASI PATH ---
+CUBE_FILENAME = 'agregat_harga.parquet'
+CUBE_PATH = os.path.join(dataset.DATA_DIR, CUBE_FILENAME)
+
+# Dimensi kubus & statistik per sel. Jumlah/total bisa dijumlahkan ke level mana pun
+# (provinsi, brand, kelas); min/max/kuartil hanya berlaku di level sel.
+DIMENSI = ['Provinsi', 'Brand', 'Kelas_Sosial']
+KUANTIL = {'Harga_Q1': 0.25, 'Harga_Median': 0.5, 'Harga_Q3': 0.75}
+
+def build_cube(df):
+    """Agregat Provinsi x Brand x Kelas_Sosial dari dataset listing (1x groupby)"""
+    grouped = df.groupby(DIMENSI, observed=True)['Harga_Int']
+    cube = grouped.agg(Jumlah='size', Total_Harga='sum', Harga_Min='min', Harga_Max='max')
+    for col, q in KUANTIL.items():
+        cube[col] = grouped.quantile(q)
+    cube = cube.reset_index()
+    for col in DIMENSI:
+        cube[col] = cube[col].astype('category')
+    return cube
+
+def save_cube(cube, path=CUBE_PATH):
+    """Simpan kubus ke Parquet secara atomik"""
+    tmp_path = path + '.tmp'
+    cube.to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, path)
+    return cube
+
+def load_cube(path=CUBE_PATH):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path, engine='pyarrow')
+
+def load_or_build(dataset_path=dataset.DATASET_PATH, path=CUBE_PATH):
+    """Kubus dari file jika masih sesuai dataset; jika belum ada/lebih lama dari dataset, bangun ulang"""
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(dataset_path):
+        return load_cube(path)
+    df = dataset.load_dataset(columns=DIMENSI + ['Harga_Int'], path=dataset_path)
+    return build_cube(df) if df is not None else None
+
+def rollup(cube, by):
+    """Jumlahkan kubus ke level `by` + rata-rata harga (Total_Harga / Jumlah)"""
+    hasil = cube.groupby(by, observed=True)[['Jumlah', 'Total_Harga']].sum().reset_index()
+    hasil['Harga_Rata'] = hasil['Total_Harga'] / hasil['Jumlah']
+    return hasil
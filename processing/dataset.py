@@ -0,0 +1,61 @@
+import pandas as pd
+import os
+
+# --- KONFIGURASI PATH ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+# Artefak utama: Parquet (kolumnar, bisa di-memory-map & dibaca per kolom)
+DATASET_FILENAME = 'hasil_analisis_final.parquet'
+DATASET_PATH = os.path.join(DATA_DIR, DATASET_FILENAME)
+
+# Export Excel sekarang hanya opsional (openpyxl lambat untuk baca & tulis)
+EXCEL_FILENAME = 'hasil_analisis_final.xlsx'
+EXCEL_PATH = os.path.join(DATA_DIR, EXCEL_FILENAME)
+
+# --- SKEMA KOLOM (DTYPE EKSPLISIT) ---
+# Kolom berulang (provinsi, brand, kelas) disimpan sebagai category agar hemat memori.
+SCHEMA = {
+    'Provinsi': 'category',
+    'Judul': 'string[pyarrow]',
+    'Harga': 'string[pyarrow]',
+    'Lokasi_Detail': 'category',
+    'Link': 'string[pyarrow]',
+    'Harga_Clean': 'string[pyarrow]',
+    'Harga_Int': 'int64',
+    'Kelas_Sosial': 'category',
+    'Brand': 'category',
+    'Model': 'category',
+    'Varian': 'category',
+    'Storage_GB': 'Int64',
+    'Skor_Anomali': 'float64',
+}
+
+def apply_schema(df):
+    """Samakan dtype & urutan kolom dengan SCHEMA (kolom tambahan ditaruh di belakang)"""
+    df = df.copy()
+    for col, dtype in SCHEMA.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+
+    ordered = [c for c in SCHEMA if c in df.columns]
+    extra = [c for c in df.columns if c not in SCHEMA]
+    return df[ordered + extra]
+
+def save_dataset(df, path=DATASET_PATH):
+    """Simpan dataset ke Parquet secara atomik (tulis ke .tmp lalu rename)"""
+    df = apply_schema(df)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, path)
+    return df
+
+def load_dataset(columns=None, path=DATASET_PATH):
+    """Baca dataset Parquet (memory-mapped). Isi `columns` untuk baca kolom tertentu saja."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path, engine='pyarrow', columns=columns, memory_map=True)
+
+def export_excel(df, path=EXCEL_PATH):
+    """Export opsional ke Excel (butuh openpyxl)"""
+    df.to_excel(path, index=False)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# --- KONFIGURASI ---
+UKURAN_HALAMAN = (50, 100, 500)  # Pilihan jumlah baris per halaman tabel
+
+class FilterIndex:
+    """
+    Index filter Provinsi x Brand: posisi baris per pasangan (kode kategori),
+    dibangun 1x per versi dataset. Filter = gabung posisi pasangan terpilih,
+    jadi biayanya sebanding jumlah hasil, bukan jumlah seluruh listing.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        prov = pd.Categorical(df['Provinsi'])
+        brand = pd.Categorical(df['Brand'])
+        self.provinsi = list(prov.categories)
+        self.brands = list(brand.categories)
+
+        # Key gabungan (kode provinsi, kode brand) -> 1 argsort untuk semua grup
+        key = prov.codes.astype(np.int64) * (len(self.brands) + 1) + brand.codes
+        order = np.argsort(key, kind='stable')
+        uniq, starts = np.unique(key[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        self.groups = {}
+        for k, start, end in zip(uniq, starts, ends):
+            p, b = divmod(int(k), len(self.brands) + 1)
+            if p < 0 or b >= len(self.brands):
+                continue  # Provinsi/Brand kosong tidak bisa dipilih di filter
+            self.groups[(self.provinsi[p], self.brands[b])] = order[start:end]
+
+        self.metrics = headline_metrics(df)
+
+    def positions(self, provinsi, brands):
+        """Posisi baris (urut seperti dataset) untuk kombinasi provinsi & brand terpilih"""
+        parts = [self.groups[(p, b)] for p in provinsi for b in brands if (p, b) in self.groups]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def page(self, positions, page, page_size, columns=None):
+        """Ambil 1 halaman hasil filter (hanya baris halaman ini yang di-materialize)"""
+        start = (page - 1) * page_size
+        rows = self.df.iloc[positions[start:start + page_size]]
+        return rows[columns] if columns is not None else rows
+
+def headline_metrics(df):
+    """Angka ringkasan untuk kartu metric (dihitung sekali per versi dataset)"""
+    return {
+        'total': len(df),
+        'harga_min': df['Harga_Int'].min(),
+        'harga_mean': df['Harga_Int'].mean(),
+        'provinsi': df['Provinsi'].nunique(),
+    }
+
+def total_pages(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
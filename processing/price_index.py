@@ -0,0 +1,109 @@
+import os
+import numpy as np
+
+from processing import dataset, anomaly, title_parser
+
+# --- KONFIGURASI ---
+# Level index dari paling spesifik ke paling umum; query turun level jika sampel < MIN_SAMPEL
+# (varian & storage lebih menentukan harga daripada provinsi -> dilepas paling akhir)
+LEVEL_INDEX = [
+    ('Model', 'Varian', 'Storage_GB', 'Provinsi'), ('Model', 'Varian', 'Storage_GB'),
+    ('Model', 'Varian', 'Provinsi'), ('Model', 'Varian'),
+    ('Model', 'Provinsi'), ('Model',),
+    ('Brand', 'Provinsi'), ('Brand',),
+]
+MIN_SAMPEL = 5
+KOLOM_INDEX = ['Brand', 'Model', 'Varian', 'Storage_GB', 'Provinsi', 'Harga_Int', 'Skor_Anomali']
+VARIAN_STANDAR = 'Standar'  # Varian kosong = model dasar ("iPhone 11" bukan "iPhone 11 Pro")
+
+def normalize_key(value):
+    """Key pencarian: case insensitive & tanpa spasi ('iPhone 11' == 'iphone11')"""
+    return str(value).lower().replace(' ', '')
+
+def parse_storage(value):
+    """'128', '128GB', '1TB' -> GB (int), None jika kosong/tidak valid"""
+    if value in (None, ''):
+        return None
+    return title_parser.parse_one(f"{value} gb" if str(value).strip().isdigit() else value)[2]
+
+def file_version(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+class PriceIndex:
+    """
+    Index harga wajar di memori: dict {(level, key): statistik}.
+    Statistik (kuartil dsb.) dihitung sekali saat build, query cukup 1-4 lookup dict.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        self.table = {}
+        self.rows = len(df)
+
+        # Listing dengan skor anomali ekstrem tidak ikut menentukan harga wajar
+        if 'Skor_Anomali' in df.columns:
+            df = df[~anomaly.is_suspicious(df['Skor_Anomali'])]
+        if 'Varian' in df.columns:
+            df = df.assign(Varian=df['Varian'].astype(object).fillna(VARIAN_STANDAR))
+
+        for cols in LEVEL_INDEX:
+            if any(c not in df.columns for c in cols):
+                continue
+            grouped = df.groupby(list(cols), observed=True)['Harga_Int']
+            stats = grouped.agg(['size', 'min', 'max'])
+            quart = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+            for key, s, q in zip(stats.index, stats.itertuples(index=False), quart.itertuples(index=False)):
+                key = key if isinstance(key, tuple) else (key,)
+                self.table[(cols, tuple(normalize_key(k) for k in key))] = {
+                    'n': int(s.size),
+                    'bawah': float(q[0]), 'tengah': float(q[1]), 'atas': float(q[2]),
+                    'min': int(s.min), 'max': int(s.max),
+                    'grup': dict(zip(cols, (str(k) for k in key))),
+                }
+
+    @classmethod
+    def from_file(cls, path=dataset.DATASET_PATH):
+        """Build index dari Parquet (hanya kolom yang dipakai). Return None jika dataset belum ada"""
+        if not os.path.exists(path):
+            return None
+        version = file_version(path)
+        import pyarrow.parquet as pq
+        available = set(pq.read_schema(path).names)
+        df = dataset.load_dataset(columns=[c for c in KOLOM_INDEX if c in available], path=path)
+        return cls(df, version)
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, brand=None, model=None, provinsi=None, varian=None, storage=None):
+        """
+        Rentang harga wajar (Q1-Q3) untuk kombinasi paling spesifik yang datanya cukup.
+        `model` boleh lengkap ("iPhone 11 Pro 256GB"): varian & storage diambil dari teksnya
+        jika tidak diisi terpisah. Model tanpa varian = varian Standar.
+        Return dict statistik + 'level', atau None jika brand/model tidak dikenal.
+        """
+        if model not in (None, ''):
+            nama, varian_judul, storage_judul = title_parser.parse_one(model)
+            if nama is not None:
+                model = nama
+                varian = varian or varian_judul or VARIAN_STANDAR
+                storage = storage or storage_judul
+        values = {'Brand': brand, 'Model': model, 'Provinsi': provinsi,
+                  'Varian': varian, 'Storage_GB': parse_storage(storage)}
+        fallback = None
+        for cols in LEVEL_INDEX:
+            if any(values[c] in (None, '') for c in cols):
+                continue
+            hit = self.table.get((cols, tuple(normalize_key(values[c]) for c in cols)))
+            if hit is None:
+                continue
+            if hit['n'] >= MIN_SAMPEL:
+                return {**hit, 'level': '+'.join(cols)}
+            fallback = fallback or {**hit, 'level': '+'.join(cols)}
+        return fallback
+
+def percentiles_ms(latencies_ns):
+    """Ringkasan latency (ms) untuk benchmark"""
+    arr = np.asarray(latencies_ns, dtype=float) / 1e6
+    return {'p50': float(np.percentile(arr, 50)), 'p99': float(np.percentile(arr, 99)), 'max': float(arr.max())}
@@ -1,63 +1,123 @@
 import pandas as pd
+import numpy as np
 import os
 import glob
 import sys
-from github import Github, Auth # Tambah Auth untuk login cara baru
-import streamlit as st
+import io
+import json
+import argparse
 
 # --- KONFIGURASI PATH ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
-OUTPUT_FILENAME = 'hasil_analisis_final.xlsx'
-OUTPUT_FILE_PATH = os.path.join(DATA_DIR, OUTPUT_FILENAME)
 
-# --- KONFIGURASI GITHUB ---
-# PASTIKAN INI BENAR (Huruf besar/kecil berpengaruh)
-# Format: "UsernameGithub/NamaRepository"
-REPO_NAME = "kakamr/FairPrice-Map" 
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import dataset, classify, cube, anomaly, title_parser
+from pipeline import metrics
 
-def upload_to_github(file_path, repo_name, file_name_in_repo):
-    """Fungsi untuk Push file ke GitHub dengan Auth terbaru"""
+OUTPUT_FILENAME = dataset.DATASET_FILENAME
+OUTPUT_FILE_PATH = dataset.DATASET_PATH
+
+# Ekstraksi Brand Sederhana (urutan = prioritas) & label kelas harga
+BRANDS = ['iphone', 'samsung', 'xiaomi', 'oppo', 'vivo', 'realme', 'infinix', 'asus', 'poco']
+KELAS_LABELS = ('Entry Level', 'Mid Range', 'Flagship/Sultan')
+
+# Watermark mode incremental (byte offset terakhir per file CSV)
+STATE_FILENAME = 'processing_state.json'
+STATE_FILE_PATH = os.path.join(DATA_DIR, STATE_FILENAME)
+ANOMALY_STATE_PATH = anomaly.STATE_PATH  # Histogram harga per grup (update incremental)
+KEYS_FILENAME = 'dedup_keys.parquet'     # Hash kunci duplikat seluruh dataset (uint64, terurut)
+KEYS_FILE_PATH = os.path.join(DATA_DIR, KEYS_FILENAME)
+
+def load_state():
+    """Baca watermark processing terakhir (byte offset per file CSV)"""
+    if not os.path.exists(STATE_FILE_PATH):
+        return {}
     try:
-        # Ambil token dari Secrets
-        token = st.secrets["github"]["token"]
-        
-        # Login menggunakan metode Auth.Token (Anti Deprecation Warning)
-        auth = Auth.Token(token)
-        g = Github(auth=auth)
-        
-        # Cek User Login (Opsional, buat debug)
-        user = g.get_user()
-        print(f"🔑 Login sebagai: {user.login}")
+        with open(STATE_FILE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
 
-        # Ambil Repo
-        print(f"🔍 Mencari repo: {repo_name}...")
-        repo = g.get_repo(repo_name)
-        
-        # Baca file Excel binary
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        # Path di dalam repo
-        repo_path = f"data/{file_name_in_repo}"
-        
-        try:
-            # Cek apakah file sudah ada
-            contents = repo.get_contents(repo_path)
-            # UPDATE (Commit message berbeda biar kelihatan update)
-            repo.update_file(contents.path, f"Auto-update: {file_name_in_repo}", content, contents.sha)
-            print(f"✅ GitHub: File '{repo_path}' berhasil di-UPDATE.")
-        except:
-            # CREATE (Jika file belum ada)
-            repo.create_file(repo_path, f"Auto-create: {file_name_in_repo}", content)
-            print(f"✅ GitHub: File '{repo_path}' berhasil di-UPLOAD baru.")
-            
-    except Exception as e:
-        print(f"❌ Gagal Push ke GitHub: {e}")
-        print("💡 Tips: Cek 'repo' permission di GitHub Token Anda & pastikan nama REPO_NAME benar.")
+def save_state(state):
+    tmp_path = STATE_FILE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_FILE_PATH)
+
+def read_new_rows(file_path, offset):
+    """Baca baris CSV yang ditambahkan setelah byte `offset`. Return (df_baru, offset_baru)."""
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        offset = max(offset, len(header))
+        f.seek(offset)
+        chunk = f.read()
+
+    # Potong baris terakhir yang belum lengkap (mungkin masih ditulis scraper)
+    end = chunk.rfind(b'\n') + 1
+    chunk = chunk[:end]
+    if not chunk:
+        return None, offset
+
+    df = pd.read_csv(io.BytesIO(header + chunk))
+    return df, offset + end
+
+def clean_data(df):
+    """Cleaning harga + kategorisasi kelas & brand (hanya untuk baris yang diberikan)"""
+    df['Harga_Clean'] = df['Harga'].astype(str).str.replace('Rp', '').str.replace('.', '').str.strip()
+    df['Harga_Int'] = pd.to_numeric(df['Harga_Clean'], errors='coerce').fillna(0).astype(int)
+
+    # Kategorisasi kelas & brand (vektor, lihat processing/classify.py)
+    df['Kelas_Sosial'] = classify.categorize_class(df['Harga_Int'], labels=KELAS_LABELS)
+    df['Brand'] = classify.extract_brand(df['Judul'], brands=BRANDS, aliases={}, default='Lainnya')
+
+    # Normalisasi judul -> Model/Varian/Storage_GB (judul yang pernah di-parse diambil dari cache)
+    parsed, n_baru = title_parser.parse_titles(df['Judul'])
+    df[title_parser.KOLOM] = parsed
+    print(f"🏷️ Parser judul: {n_baru} judul baru di-parse, sisanya dari cache.")
+    return df
+
+def key_hash(df):
+    """Hash kunci duplikat per baris (dtype disamakan dulu agar hash konsisten)"""
+    keys = pd.DataFrame({
+        'Judul': df['Judul'].astype(str),
+        'Harga_Int': df['Harga_Int'].astype('int64'),
+        'Lokasi_Detail': df['Lokasi_Detail'].astype(str),
+    })
+    return pd.util.hash_pandas_object(keys, index=False)
+
+def load_keys():
+    """Hash kunci yang sudah ada di dataset (array uint64 terurut), None jika belum ada"""
+    if not os.path.exists(KEYS_FILE_PATH):
+        return None
+    try:
+        return pd.read_parquet(KEYS_FILE_PATH, engine='pyarrow')['hash'].to_numpy(dtype=np.uint64)
+    except Exception:
+        return None
+
+def save_keys(keys):
+    tmp_path = KEYS_FILE_PATH + '.tmp'
+    pd.DataFrame({'hash': keys}).to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, KEYS_FILE_PATH)
+
+def is_known(hashes, keys):
+    """True per hash yang sudah ada di `keys` (binary search, tanpa membangun hash table histori)"""
+    if not len(keys):
+        return np.zeros(len(hashes), dtype=bool)
+    pos = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+    return keys[pos] == hashes
 
-def process_data():
+def process_data(export_excel=False, full=False):
+    """Processing + metrik terstruktur (durasi per langkah, jumlah baris, ukuran output)"""
+    with metrics.Timer('processing', 'selesai', excel=export_excel) as metrik:
+        _process_data(export_excel, full, metrik)
+
+def _process_data(export_excel, full, metrik):
     print(f"⚙️ Memulai Processing & Sync...")
+    sw = metrics.Stopwatch()
+    metrik.update(langkah=sw.laps, baris_dibaca=0, baris_ditulis=0)
 
     # 1. Load CSV
     search_path = os.path.join(DATA_DIR, "*.csv")
@@ -66,54 +126,123 @@ def process_data():
     if not csv_files: 
         print("❌ Tidak ada file CSV ditemukan.")
         return
+
+    # Mode incremental hanya jika watermark & dataset lama tersedia
+    state = {} if full else load_state()
+    df_old = dataset.load_dataset(path=OUTPUT_FILE_PATH) if state else None
+    # Dataset lama tanpa kolom model (versi sebelum parser judul) -> proses ulang semua
+    if df_old is not None and not set(title_parser.KOLOM) <= set(df_old.columns):
+        print("⚠️ Dataset lama belum punya kolom Model/Varian/Storage_GB. Beralih ke full processing.")
+        df_old = None
+    offsets = state.get('files', {}) if df_old is not None else {}
+
+    # File CSV menyusut = ditulis ulang -> watermark tidak valid, proses ulang semua
+    for f in csv_files:
+        if os.path.getsize(f) < offsets.get(os.path.basename(f), 0):
+            print(f"⚠️ {os.path.basename(f)} berubah total. Beralih ke full processing.")
+            df_old, offsets = None, {}
+            break
+
+    if df_old is None:
+        print("🔁 Mode: FULL (proses semua baris).")
+    else:
+        print(f"⏩ Mode: INCREMENTAL (dataset lama: {len(df_old)} baris).")
+    metrik['mode'] = 'full' if df_old is None else 'incremental'
     
     df_list = []
+    new_offsets = {}
     for f in csv_files:
+        name = os.path.basename(f)
+        new_offsets[name] = offsets.get(name, 0)
         try:
-            df_list.append(pd.read_csv(f))
+            df_new, new_offsets[name] = read_new_rows(f, new_offsets[name])
+            if df_new is not None:
+                df_list.append(df_new)
         except: pass
+    sw.lap('baca_csv')
         
-    if not df_list: return
+    if not df_list:
+        print("✅ Tidak ada baris baru sejak processing terakhir.")
+        return
 
     df = pd.concat(df_list, ignore_index=True)
+    print(f"📥 Baris baru dibaca: {len(df)}")
+    metrik['baris_dibaca'] = len(df)
     
-    # 2. Cleaning & Processing
-    # (Logika Cleaning kamu)
-    df['Harga_Clean'] = df['Harga'].astype(str).str.replace('Rp', '').str.replace('.', '').str.strip()
-    df['Harga_Int'] = pd.to_numeric(df['Harga_Clean'], errors='coerce').fillna(0).astype(int)
-
-    def categorize_class(price):
-        if price > 5000000: return 'Flagship/Sultan'
-        elif 2000000 <= price <= 5000000: return 'Mid Range'
-        else: return 'Entry Level'
-
-    df['Kelas_Sosial'] = df['Harga_Int'].apply(categorize_class)
-    
-    # Ekstraksi Brand Sederhana
-    brands = ['iphone', 'samsung', 'xiaomi', 'oppo', 'vivo', 'realme', 'infinix', 'asus', 'poco']
-    def extract_brand(title):
-        t = str(title).lower()
-        for b in brands:
-            if b in t: return b.capitalize()
-        return 'Lainnya'
-    df['Brand'] = df['Judul'].apply(extract_brand)
+    # 2. Cleaning & Processing (hanya baris baru)
+    df = clean_data(df)
+    sw.lap('cleaning')
     
-    # 3. Hapus Duplikat
+    # 3. Hapus Duplikat (di antara baris baru, lalu terhadap dataset lama)
     df.drop_duplicates(subset=['Judul', 'Harga_Int', 'Lokasi_Detail'], keep='first', inplace=True)
+    stats = None
+    keys = None
+    if df_old is not None:
+        # Set hash tersimpan dipakai ulang; histori hanya di-hash ulang jika set belum ada/tidak cocok
+        keys = load_keys()
+        if keys is None or len(keys) != len(df_old):
+            print("⚠️ Set kunci dedup belum ada/tidak cocok. Dibangun ulang dari dataset lama.")
+            keys = np.sort(key_hash(df_old).to_numpy())
+        hashes = key_hash(df).to_numpy()
+        baru = ~is_known(hashes, keys)
+        df = df[baru]
+        keys = np.sort(np.concatenate([keys, hashes[baru]]), kind='stable')  # Radix sort, hampir O(n)
+        print(f"➕ Baris baru unik: {len(df)}")
+    metrik['baris_duplikat'] = metrik['baris_dibaca'] - len(df)
+    metrik['baris_baru'] = len(df)
+    sw.lap('dedup')
+    if df_old is not None:
+        # Statistik anomali lama + baris baru saja (histori tidak di-scan ulang)
+        stats = anomaly.AnomalyStats.load(ANOMALY_STATE_PATH)
+        if stats is None:
+            stats = anomaly.AnomalyStats().update(df_old)
+        stats.update(df)
+        df = pd.concat([df_old, dataset.apply_schema(df)], ignore_index=True)
+    else:
+        stats = anomaly.AnomalyStats().update(df)
+        keys = np.sort(key_hash(df).to_numpy())
     print(f"📊 Total Data Bersih: {len(df)}")
 
-    # 4. SIMPAN LOKAL & PUSH
+    # Skor anomali harga per listing (lookup median/MAD grup, vektor)
+    df['Skor_Anomali'] = stats.score(df)
+    print(f"🚨 Listing harga mencurigakan: {anomaly.is_suspicious(df['Skor_Anomali']).sum()}")
+    sw.lap('skor_anomali')
+
+    # 4. SIMPAN LOKAL
     try:
-        # Simpan lokal dulu (wajib)
-        df.to_excel(OUTPUT_FILE_PATH, index=False)
-        print(f"💾 Simpan Lokal OK.")
-        
-        # Upload ke GitHub
-        print("☁️ Mengupload ke GitHub...")
-        upload_to_github(OUTPUT_FILE_PATH, REPO_NAME, OUTPUT_FILENAME)
+        # Simpan lokal dulu (wajib) -> Parquet dengan dtype eksplisit
+        df = dataset.save_dataset(df, OUTPUT_FILE_PATH)
+        print(f"💾 Simpan Lokal OK ({OUTPUT_FILENAME}).")
+        metrik['baris_ditulis'] = len(df)
+        metrik['ukuran_dataset'] = metrics.file_size(OUTPUT_FILE_PATH)
+        sw.lap('simpan_dataset')
+
+        # Kubus agregat (Provinsi x Brand x Kelas) untuk grafik & peta
+        cube.save_cube(cube.build_cube(df))
+        print(f"🧊 Kubus agregat OK ({cube.CUBE_FILENAME}).")
+        metrik['ukuran_kubus'] = metrics.file_size(cube.CUBE_PATH)
+        sw.lap('kubus')
+
+        # Watermark, set kunci dedup & statistik anomali disimpan SETELAH dataset aman tersimpan
+        stats.save(ANOMALY_STATE_PATH)
+        save_keys(keys)
+        save_state({'files': new_offsets, 'rows': len(df)})
+
+        # Export Excel hanya jika diminta
+        if export_excel:
+            dataset.export_excel(df)
+            print(f"📗 Export Excel OK ({dataset.EXCEL_FILENAME}).")
+            sw.lap('excel')
+
+        # Upload ke GitHub dilakukan terpisah oleh pipeline/publish.py (setelah peta dibangun)
         
     except Exception as e:
         print(f"❌ Error Saving: {e}")
+        metrik['error'] = str(e)
 
 if __name__ == "__main__":
-    process_data()
+    parser = argparse.ArgumentParser(description="Processing data hasil scraping")
+    parser.add_argument("--excel", action="store_true", help="Ikut export ke Excel (opsional, lambat)")
+    parser.add_argument("--full", action="store_true", help="Abaikan watermark & proses ulang semua CSV")
+    args = parser.parse_args()
+    process_data(export_excel=args.excel, full=args.full)
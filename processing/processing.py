@@ -1,12 +1,20 @@
 import pandas as pd
 import os
+import sys
 import glob
+import argparse
+
+# Agar modul di folder 'processing' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from processing import dataset, classify, cube, anomaly, title_parser
 
 # --- KONFIGURASI ---
 FOLDER_NAME = 'data'  # Nama folder
-OUTPUT_FILE = 'hasil_analisis_final.xlsx' # Nama file output
+OUTPUT_FILE = dataset.DATASET_FILENAME # Nama file output (Parquet)
 
-def process_data():
+def process_data(export_excel=False):
     # Cek apakah folder ada
     if not os.path.exists(FOLDER_NAME):
         print(f"❌ Error: Folder '{FOLDER_NAME}' tidak ditemukan.")
@@ -47,45 +55,37 @@ def process_data():
     df['Harga_Clean'] = df['Harga'].astype(str).str.replace('Rp', '', case=False).str.replace('.', '').str.strip()
     df['Harga_Int'] = pd.to_numeric(df['Harga_Clean'], errors='coerce').fillna(0).astype(int)
 
-    # B. Kategorisasi Kelas (Range Baru: <2jt, 2-5jt, >5jt)
-    def categorize_class(price):
-        if price > 5000000:
-            return 'High End / Sultan'
-        elif 2000000 <= price <= 5000000:
-            return 'Middle Class'
-        else:
-            return 'Entry Level'
-
-    df['Kelas_Sosial'] = df['Harga_Int'].apply(categorize_class)
+    # B. Kategorisasi Kelas (Range Baru: <2jt, 2-5jt, >5jt) -> binning vektor
+    df['Kelas_Sosial'] = classify.categorize_class(
+        df['Harga_Int'], labels=('Entry Level', 'Middle Class', 'High End / Sultan')
+    )
 
-    # C. Ekstraksi Brand
-    brands = [
-        'iphone', 'samsung', 'xiaomi', 'redmi', 'oppo', 'vivo', 
-        'realme', 'infinix', 'asus', 'rog', 'google', 'pixel', 
-        'poco', 'tecno', 'itel', 'sony', 'huawei', 'nokia', 'advan'
-    ]
+    # C. Ekstraksi Brand (1 regex untuk semua brand, alias rog/redmi/pixel ikut di classify.py)
+    df['Brand'] = classify.extract_brand(df['Judul'])
 
-    def extract_brand(title):
-        title_lower = str(title).lower()
-        for brand in brands:
-            if brand in title_lower:
-                if brand == 'rog': return 'Asus'
-                if brand == 'redmi': return 'Xiaomi'
-                if brand == 'pixel': return 'Google'
-                return brand.capitalize()
-        return 'Lainnya/Unknown'
+    # D. Model, Varian & Storage dari judul (memo persisten di data/cache)
+    parsed, _ = title_parser.parse_titles(df['Judul'])
+    df[title_parser.KOLOM] = parsed
 
-    df['Brand'] = df['Judul'].apply(extract_brand)
+    # E. Skor Anomali Harga (median/MAD per Brand x Kelas x Provinsi, lihat anomaly.py)
+    df['Skor_Anomali'] = anomaly.AnomalyStats().update(df).score(df)
 
     # 4. SIMPAN KE FOLDER DATA
-    # Path lengkap: data/hasil_analisis_final.xlsx
+    # Path lengkap: data/hasil_analisis_final.parquet
     output_path = os.path.join(FOLDER_NAME, OUTPUT_FILE)
     
     try:
-        df.to_excel(output_path, index=False)
+        df = dataset.save_dataset(df, output_path)
+        cube_path = os.path.join(FOLDER_NAME, cube.CUBE_FILENAME)
+        cube.save_cube(cube.build_cube(df), cube_path)
         print("\n" + "="*50)
         print(f"🎉 SUKSES! File berhasil disimpan di:")
         print(f"📂 {output_path}")
+        print(f"🧊 {cube_path}")
+        if export_excel:
+            excel_path = os.path.join(FOLDER_NAME, dataset.EXCEL_FILENAME)
+            dataset.export_excel(df, excel_path)
+            print(f"📗 {excel_path}")
         print("="*50)
         
         # Info Singkat
@@ -93,7 +93,10 @@ def process_data():
         
     except Exception as e:
         print(f"❌ Gagal menyimpan file: {e}")
-        print("Pastikan file Excel tidak sedang dibuka!")
+        print("Pastikan file output tidak sedang dibuka!")
 
 if __name__ == "__main__":
-    process_data()
+    parser = argparse.ArgumentParser(description="Processing data hasil scraping (versi lokal)")
+    parser.add_argument("--excel", action="store_true", help="Ikut export ke Excel (opsional, lambat)")
+    args = parser.parse_args()
+    process_data(export_excel=args.excel)
@@ -0,0 +1,144 @@
+import os
+import re
+import functools
+import numpy as np
+import pandas as pd
+
+from processing import dataset
+
+# --- KONFIGURASI CACHE ---
+# Naikkan PARSER_VERSI jika pola diubah -> file cache baru, judul di-parse ulang
+PARSER_VERSI = 1
+CACHE_DIR = os.path.join(dataset.DATA_DIR, 'cache')
+CACHE_PATH = os.path.join(CACHE_DIR, f'judul_model_v{PARSER_VERSI}.parquet')
+
+KOLOM = ['Model', 'Varian', 'Storage_GB']
+
+# --- POLA MODEL (judul lowercase) ---
+# (nama seri, pola kode model). Urutan = prioritas; judul sering tanpa nama brand
+# ("reno 8", "galaxy a06"), jadi pola memakai nama seri, bukan brand saja.
+MODEL_PATTERNS = [
+    ('iPhone', r'\biphone\s*(\d{1,2}|xs|xr|x|se)\b'),
+    ('Galaxy Z Fold', r'\bz\s*fold\s*(\d)'),
+    ('Galaxy Z Flip', r'\bz\s*flip\s*(\d)'),
+    ('Galaxy', r'\b(?:samsung|galaxy)\s+(?:galaxy\s+)?(note\s*\d{1,2}|[asmjf]\s?\d{1,3}s?)'),
+    ('Redmi', r'\bredmi\s+(note\s*\d{1,2}[a-z]?|\d{1,2}[a-z]?)\b'),
+    ('Poco', r'\bpoco\s*([xfmc]\d{1,2})'),
+    ('Xiaomi', r'\b(?:xiaomi|mi)\s+(\d{1,2}t?)\b'),
+    ('Oppo Reno', r'\breno\s*(\d{1,2})'),
+    ('Oppo', r'\boppo\s+(find\s*x\d|[afk]\d{1,2})'),
+    ('Vivo', r'\bvivo\s*([vyxt]\d{1,3}[a-z]?)'),
+    ('iQOO', r'\biqoo\s*(z\s*\d{1,2}|neo\s*\d{1,2}|\d{1,2})'),
+    ('Realme', r'\brealme\s+(c\d{1,2}|narzo\s*\d{1,2}|gt\s*\d?|\d{1,2})'),
+    ('Infinix', r'\b((?:hot|smart|zero)\s*\d{1,2}[a-z]?)'),
+    ('Infinix', r'\binfinix\s+(note\s*\d{1,2}[a-z]?)'),
+    ('Tecno', r'\b((?:spark|camon|pova)\s*(?:go\s*)?\d{1,2})'),
+    ('Itel', r'\bitel\s+([a-z]\d{2})'),
+    ('Pixel', r'\bpixel\s*(\d{1,2}a?)'),
+    ('Huawei', r'\bhuawei\s+((?:p|mate|nova)\s*\d{1,2})'),
+    ('ROG Phone', r'\brog\s*phone\s*(\d)'),
+    ('Nokia', r'\bnokia\s+([a-z]?\d{2,4})'),
+]
+
+# Varian harus langsung setelah kode model ("13 pro max", "s24ultra", "s25fe")
+VARIAN_RE = r'(?:\s*(pro\s*max|promax|pro\s*xl|pro\s*\+|pro\s*plus|ultra|pro|plus|max|mini|lite|fe|neo)(?![a-z]))?'
+VARIAN_KANONIK = {'promax': 'Pro Max', 'pro+': 'Pro Plus', 'proplus': 'Pro Plus', 'proxl': 'Pro XL', 'fe': 'FE'}
+
+COMPILED = [(seri, re.compile(pola + VARIAN_RE)) for seri, pola in MODEL_PATTERNS]
+
+# Storage: angka + GB/TB, angka setelah "/" (RAM/ROM: "8/256"), atau ukuran umum tanpa satuan
+STORAGE_RE = re.compile(r'(?P<tb>\d)\s*tb\b|(?P<gb>\d{2,4})\s*gb?\b|/\s*(?P<slash>\d{2,4})\b|\b(?P<bare>64|128|256|512)\b')
+STORAGE_VALID = [16, 32, 64, 128, 256, 512, 1024]
+
+def _rapikan_kode(kode):
+    """'note  11' -> 'Note 11', 'a 33' -> 'A33', 'a52s' -> 'A52s', 'xr' -> 'XR'"""
+    kode = re.sub(r'\s+', ' ', kode.strip())
+    kode = re.sub(r'^([a-z]) (\d)', r'\1\2', kode)
+    if kode.isalpha() and len(kode) <= 2:
+        return kode.upper()
+    return ' '.join(w[:1].upper() + w[1:] for w in kode.split(' '))
+
+def _rapikan_varian(varian):
+    varian = re.sub(r'\s+', ' ', varian.strip())
+    return VARIAN_KANONIK.get(varian.replace(' ', ''), varian.title())
+
+def parse_unique(judul):
+    """Parse judul unik (Series string) -> DataFrame Model/Varian/Storage_GB, pola dijalankan per kolom"""
+    lowered = pd.Series(judul, dtype=object).astype(str).str.lower().reset_index(drop=True)
+    model = pd.Series(None, index=lowered.index, dtype=object)
+    varian = pd.Series(None, index=lowered.index, dtype=object)
+
+    for seri, pattern in COMPILED:
+        todo = model.isna()
+        if not todo.any():
+            break
+        found = lowered[todo].str.extract(pattern)
+        hit = found[0].notna()
+        idx = found.index[hit]
+        model[idx] = seri + ' ' + found.loc[hit, 0].map(_rapikan_kode)
+        varian[idx] = found.loc[hit, 1].map(_rapikan_varian, na_action='ignore')
+
+    # Storage = kandidat terbesar yang merupakan ukuran storage umum (RAM 4/8 GB tersaring)
+    matches = lowered.str.extractall(STORAGE_RE)
+    nilai = pd.to_numeric(matches['gb'].fillna(matches['slash']).fillna(matches['bare']), errors='coerce')
+    nilai = nilai.fillna(pd.to_numeric(matches['tb'], errors='coerce') * 1024)
+    nilai = nilai[nilai.isin(STORAGE_VALID)]
+    storage = nilai.groupby(level=0).max().reindex(lowered.index)
+
+    return pd.DataFrame({
+        'Model': model.to_numpy(),
+        'Varian': varian.to_numpy(),
+        'Storage_GB': storage.astype('Int64').array,
+    }, index=pd.Index(judul, name='Judul'))
+
+@functools.lru_cache(maxsize=4096)
+def parse_one(judul):
+    """Parse 1 judul/query (tanpa pandas, untuk lookup) -> (Model, Varian, Storage_GB), None jika tidak dikenal"""
+    lowered = str(judul).lower()
+    model = varian = None
+    for seri, pattern in COMPILED:
+        found = pattern.search(lowered)
+        if found:
+            model = seri + ' ' + _rapikan_kode(found.group(1))
+            varian = _rapikan_varian(found.group(2)) if found.group(2) else None
+            break
+
+    kandidat = []
+    for m in STORAGE_RE.finditer(lowered):
+        if m.group('tb'):
+            kandidat.append(int(m.group('tb')) * 1024)
+        else:
+            kandidat.append(int(m.group('gb') or m.group('slash') or m.group('bare')))
+    kandidat = [x for x in kandidat if x in STORAGE_VALID]
+    return model, varian, max(kandidat) if kandidat else None
+
+def load_cache(path=CACHE_PATH):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=KOLOM, index=pd.Index([], name='Judul'))
+    return pd.read_parquet(path, engine='pyarrow')
+
+def save_cache(cache, path=CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    cache.to_parquet(tmp_path, engine='pyarrow')
+    os.replace(tmp_path, path)
+
+def parse_titles(judul, cache_path=CACHE_PATH):
+    """
+    Model/Varian/Storage_GB per baris. Judul unik dicari dulu di cache persisten
+    (judul -> model); hanya judul yang belum pernah dilihat yang di-parse.
+    Return (DataFrame sejajar dengan `judul`, jumlah judul baru yang di-parse).
+    """
+    codes, uniques = pd.factorize(judul.astype(str))
+    cache = load_cache(cache_path)
+    baru = uniques[~uniques.isin(cache.index)]
+
+    if len(baru):
+        cache = pd.concat([cache, parse_unique(baru)]) if len(cache) else parse_unique(baru)
+        save_cache(cache, cache_path)
+
+    table = cache.reindex(uniques)
+    hasil = table.iloc[np.where(codes < 0, 0, codes)].reset_index(drop=True) if len(uniques) else table
+    hasil.index = judul.index
+    hasil.loc[codes < 0, KOLOM] = None  # Judul kosong
+    return hasil.astype({'Storage_GB': 'Int64'}), len(baru)
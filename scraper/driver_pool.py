@@ -0,0 +1,201 @@
+import os
+import json
+import queue
+import threading
+from contextlib import contextmanager
+from multiprocessing.util import Finalize
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# --- KONFIGURASI ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache")
+DRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "chromedriver.json")  # Hasil resolve driver (lintas run)
+
+# Fallback manual Linux (Streamlit Cloud, lihat packages.txt)
+LINUX_CHROMIUM = "/usr/bin/chromium"
+LINUX_CHROMEDRIVER = "/usr/bin/chromedriver"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+
+_resolved = None  # {"driver_path": ..., "binary_location": ...}
+_pool = None
+
+def _save_resolved(resolved):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(resolved, f)
+
+def _load_cached():
+    try:
+        with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _linux_fallback():
+    return {"driver_path": LINUX_CHROMEDRIVER, "binary_location": LINUX_CHROMIUM}
+
+def resolve_driver(force=False):
+    """
+    Cari chromedriver SEKALI: memori -> file cache -> ChromeDriverManager -> fallback Linux.
+    `force=True` melewati memori & cache (driver cache basi, mis. setelah Chrome auto-update).
+    Hasil baru disimpan ke cache oleh DriverPool setelah terbukti bisa membuka sesi.
+    """
+    global _resolved
+    if _resolved and not force:
+        return _resolved
+
+    cached = None if force else _load_cached()
+    if cached and os.path.exists(cached.get("driver_path", "")):
+        _resolved = cached
+        return _resolved
+
+    try:
+        _resolved = {"driver_path": ChromeDriverManager().install(), "binary_location": None}
+    except Exception:
+        print("      ⚠️ Driver otomatis tidak tersedia. Beralih ke konfigurasi manual Linux...")
+        _resolved = _linux_fallback()
+    return _resolved
+
+def build_options(headless=True, extra_args=(), binary_location=None):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-agent={USER_AGENT}")
+    for arg in extra_args:
+        options.add_argument(arg)
+    if binary_location:
+        options.binary_location = binary_location
+    return options
+
+class DriverPool:
+    """
+    Pool sesi Chrome yang tetap hidup (warm) dan dipakai ulang antar provinsi/run
+    di process yang sama. Maksimal `size` browser aktif sekaligus.
+    """
+
+    def __init__(self, size=1, headless=True, extra_args=()):
+        self.size = size
+        self.headless = headless
+        self.extra_args = tuple(extra_args)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _start(self, resolved):
+        options = build_options(self.headless, self.extra_args, resolved["binary_location"])
+        return webdriver.Chrome(service=Service(resolved["driver_path"]), options=options)
+
+    def _create(self):
+        """
+        Urutan: driver cache/memori -> resolve ulang ChromeDriverManager (cache basi setelah
+        Chrome update) -> manual Linux. Konfigurasi hanya disimpan ke cache jika sesi berhasil dibuka.
+        """
+        global _resolved
+        tried, error = [], None
+        for langkah in ("cache", "resolve_ulang", "linux"):
+            if langkah == "cache":
+                resolved = resolve_driver()
+            elif langkah == "resolve_ulang":
+                print("      ⚠️ Driver tidak cocok dengan browser. Resolve ulang chromedriver...")
+                resolved = resolve_driver(force=True)
+            else:
+                print("      ⚠️ Driver otomatis tidak cocok. Beralih ke konfigurasi manual Linux...")
+                resolved = _linux_fallback()
+            if resolved in tried:
+                continue
+            tried.append(resolved)
+
+            try:
+                driver = self._start(resolved)
+            except Exception as e:
+                error = e
+                continue
+            _resolved = resolved
+            if resolved != _load_cached():
+                _save_resolved(resolved)
+            return driver
+
+        # Semua gagal -> acquire berikutnya mulai resolve dari awal lagi
+        _resolved = None
+        raise error
+
+    def _is_alive(self, driver):
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """Ambil sesi warm jika ada, buat baru jika kuota belum penuh, atau tunggu sesi dikembalikan"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._create()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                driver = self._idle.get()
+
+            if self._is_alive(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver):
+        """Kembalikan sesi ke pool setelah dibersihkan (cookie & halaman)"""
+        if driver is None:
+            return
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            self._idle.put(driver)
+        except Exception:
+            self._discard(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+def get_pool(size=1, headless=True, extra_args=()):
+    """Pool global per process (worker paralel masing-masing punya pool sendiri)"""
+    global _pool
+    if _pool is None:
+        _pool = DriverPool(size=size, headless=headless, extra_args=extra_args)
+        # Tutup semua browser saat process selesai (berlaku juga di worker multiprocessing)
+        Finalize(None, _pool.close, exitpriority=10)
+    return _pool
@@ -0,0 +1,133 @@
+import os
+import time
+import asyncio
+import aiohttp
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+
+from scraper import olx_page, seen_index
+from pipeline import metrics
+
+# --- KONFIGURASI ---
+MAX_KONEKSI = 8          # Batas koneksi HTTP bersamaan (connection pool)
+MAX_HALAMAN = 50         # Batas aman jumlah halaman per provinsi
+TIMEOUT_DETIK = 20
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
+    "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+}
+
+# XPath setara dengan selector CSS di olx_page
+XP_ITEM = "//li[@data-aut-id='itemBox']"
+XP_TITLE = ".//span[@data-aut-id='itemTitle']"
+XP_PRICE = ".//span[@data-aut-id='itemPrice']"
+XP_LOCATION = ".//span[@data-aut-id='item-location']"
+
+def _first_text(node, xpath):
+    found = node.xpath(xpath)
+    return found[0].text_content().strip() if found else None
+
+def parse_listing_page(page_html, provinsi, base_url=olx_page.OLX_BASE_URL):
+    """Parse 1 halaman listing (HTML) jadi list baris, format sama dengan engine Selenium"""
+    tree = lxml_html.fromstring(page_html)
+    rows = []
+    for item in tree.xpath(XP_ITEM):
+        hrefs = item.xpath(".//a/@href")
+        record = olx_page.make_record(
+            provinsi,
+            _first_text(item, XP_TITLE),
+            _first_text(item, XP_PRICE),
+            _first_text(item, XP_LOCATION),
+            urljoin(base_url + "/", hrefs[0]) if hrefs else None,
+        )
+        if record:
+            rows.append(record)
+    return rows
+
+async def _fetch(session, url, record_path=None):
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        text = await resp.text()
+
+    # Simpan halaman mentah agar bisa diputar ulang lewat stub_server.py
+    if record_path:
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        with open(record_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+async def scrape_provinsi_async(session, provinsi, slug, target, base_url, record_dir=None, batch=4, seen=None):
+    """
+    Ambil halaman 1..N per batch paralel sampai target tercapai, halaman kosong,
+    atau halaman didominasi listing yang sudah pernah di-scrape (`seen`).
+    """
+    rows, seen_links = [], set()
+    page = 1
+    start, halaman = time.perf_counter(), 0
+    while len(rows) < target and page <= MAX_HALAMAN:
+        pages = range(page, min(page + batch, MAX_HALAMAN + 1))
+        tasks = []
+        for p in pages:
+            record_path = os.path.join(record_dir, slug, f"page_{p}.html") if record_dir else None
+            tasks.append(_fetch(session, olx_page.listing_url(slug, base_url, p), record_path))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        halaman += len(tasks)
+
+        habis = False
+        for p, result in zip(pages, results):
+            if isinstance(result, Exception):
+                print(f"      ⚠️ {provinsi} halaman {p} gagal: {result}")
+                habis = True
+                break
+            page_rows = [r for r in parse_listing_page(result, provinsi, base_url) if r["Link"] not in seen_links]
+            if not page_rows:
+                habis = True
+                break
+            seen_links.update(r["Link"] for r in page_rows)
+
+            if seen is not None:
+                sudah_dilihat = seen.fraction_seen([r["Link"] for r in page_rows])
+                page_rows = seen.filter_new(page_rows)
+                if sudah_dilihat >= seen_index.BATAS_SUDAH_DILIHAT:
+                    print(f"      🛑 {provinsi}: halaman {p} mayoritas sudah pernah di-scrape. Stop.")
+                    rows.extend(page_rows)
+                    habis = True
+                    break
+            rows.extend(page_rows)
+
+        print(f"      -> {provinsi}: data terkumpul {len(rows)} / {target}")
+        if habis:
+            break
+        page += batch
+
+    durasi = time.perf_counter() - start
+    metrics.emit(
+        'scraper', 'provinsi', provinsi=provinsi, engine='http', durasi=round(durasi, 3), halaman=halaman,
+        item_dimuat=len(seen_links), item_baru=len(rows),
+        item_per_detik=round(len(seen_links) / durasi, 2) if durasi > 0 else None,
+    )
+    return rows
+
+async def scrape_all(daftar_lokasi, target, base_url, max_koneksi=MAX_KONEKSI, record_dir=None, seen=None):
+    # 1 ClientSession + TCPConnector = koneksi keep-alive dipakai ulang untuk semua request
+    connector = aiohttp.TCPConnector(limit=max_koneksi)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_DETIK)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
+        tasks = [
+            scrape_provinsi_async(session, provinsi, slug, target, base_url, record_dir, seen=seen)
+            for provinsi, slug in daftar_lokasi.items()
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    hasil = {}
+    for provinsi, result in zip(daftar_lokasi, results):
+        if isinstance(result, Exception):
+            print(f"   ❌ TERJADI ERROR DI {provinsi}: {result}")
+            result = []
+        hasil[provinsi] = result
+    return hasil
+
+def run(daftar_lokasi, target, base_url=olx_page.OLX_BASE_URL, max_koneksi=MAX_KONEKSI, record_dir=None, seen=None):
+    """Engine HTTP tanpa browser. Return dict {provinsi: [baris, ...]}"""
+    print(f"🌐 Engine HTTP: {base_url} (maks {max_koneksi} koneksi)")
+    return asyncio.run(scrape_all(daftar_lokasi, target, base_url.rstrip("/"), max_koneksi, record_dir, seen))
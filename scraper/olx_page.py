@@ -0,0 +1,69 @@
+# --- SELECTOR HALAMAN LISTING OLX ---
+# Dipakai bersama oleh engine Selenium & engine HTTP agar hasil barisnya sama persis.
+SEL_ITEM = "li[data-aut-id='itemBox']"
+SEL_TITLE = "span[data-aut-id='itemTitle']"
+SEL_PRICE = "span[data-aut-id='itemPrice']"
+SEL_LOCATION = "span[data-aut-id='item-location']"
+SEL_LOAD_MORE = "button[data-aut-id='btnLoadMore']"
+
+OLX_BASE_URL = "https://www.olx.co.id"
+KATEGORI_HP = "handphone_c208"
+
+def listing_url(slug, base_url=OLX_BASE_URL, page=1):
+    url = f"{base_url}/{slug}/{KATEGORI_HP}"
+    return url if page <= 1 else f"{url}?page={page}"
+
+def make_record(provinsi, judul, harga_text, lokasi, link):
+    """Normalisasi 1 item jadi baris CSV (Provinsi, Judul, Harga, Lokasi_Detail, Link). None = tidak valid."""
+    judul = judul or "N/A"
+    harga_clean = harga_text.replace("Rp", "").replace(".", "").strip() if harga_text else "0"
+    if harga_clean == "0" or judul == "N/A":
+        return None
+
+    return {
+        "Provinsi": provinsi,
+        "Judul": judul,
+        "Harga": harga_clean,
+        "Lokasi_Detail": lokasi or provinsi,
+        "Link": link or "N/A"
+    }
+
+# --- EKSTRAKSI MASSAL (1 ROUND TRIP WEBDRIVER) ---
+# Semua field semua item diambil di dalam halaman sekaligus, bukan find_element per field.
+COUNT_ITEMS_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+EXTRACT_ITEMS_JS = """
+const [start, selItem, selTitle, selPrice, selLocation] = arguments;
+const text = (el, sel) => { const n = el.querySelector(sel); return n ? n.innerText.trim() : null; };
+const items = document.querySelectorAll(selItem);
+const out = [];
+for (let i = start; i < items.length; i++) {
+    const it = items[i];
+    const a = it.querySelector('a');
+    out.push([text(it, selTitle), text(it, selPrice), text(it, selLocation), a ? a.href : null]);
+}
+return out;
+"""
+
+EXTRACT_LINKS_JS = """
+const items = document.querySelectorAll(arguments[1]);
+const out = [];
+for (let i = arguments[0]; i < items.length; i++) {
+    const a = items[i].querySelector('a');
+    out.push(a ? a.href : null);
+}
+return out;
+"""
+
+def count_items(driver):
+    return driver.execute_script(COUNT_ITEMS_JS, SEL_ITEM)
+
+def extract_links(driver, start=0):
+    """Link item mulai index `start` (untuk cek listing yang sudah pernah di-scrape)"""
+    return driver.execute_script(EXTRACT_LINKS_JS, start, SEL_ITEM)
+
+def extract_items(driver, provinsi, start=0):
+    """Ambil semua item (mulai index `start`) dalam 1 execute_script. Return list baris valid."""
+    raw = driver.execute_script(EXTRACT_ITEMS_JS, start, SEL_ITEM, SEL_TITLE, SEL_PRICE, SEL_LOCATION)
+    records = (make_record(provinsi, *fields) for fields in raw)
+    return [r for r in records if r]
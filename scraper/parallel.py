@@ -0,0 +1,109 @@
+import os
+import glob
+import shutil
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline import runner
+
+# --- KONFIGURASI ---
+# Output per provinsi ditaruh di subfolder agar tidak ikut ter-glob 'data/*.csv' oleh processing
+PARTS_FOLDER = "parts"
+
+def get_parts_dir(output_path):
+    return os.path.join(os.path.dirname(output_path), PARTS_FOLDER)
+
+def _scrape_to_part(scrape_fn, provinsi, slug, part_path):
+    """Dijalankan di worker process: scrape 1 provinsi lalu tulis ke file part sendiri"""
+    rows = scrape_fn(provinsi, slug)
+    if rows:
+        pd.DataFrame(rows).to_csv(part_path, index=False)
+    return len(rows)
+
+def _trim_partial_line(f, size, block=64 * 1024):
+    """Buang baris terakhir yang tidak lengkap (sisa merge yang crash). Return ukuran file baru."""
+    end = size
+    while end > 0:
+        start = max(0, end - block)
+        f.seek(start)
+        pos = f.read(end - start).rfind(b"\n")
+        if pos >= 0:
+            end = start + pos + 1
+            break
+        end = start
+    if end != size:
+        f.truncate(end)
+        print(f"   ⚠️ {size - end} byte baris terpotong di akhir CSV dibuang.")
+    return end
+
+def merge_parts(part_files, output_path):
+    """
+    Tempel semua file part ke akhir output utama (append di tempat, I/O sebesar part saja).
+    Dijalankan di bawah pipeline.lock & di-fsync sebelum return, jadi watermark byte offset
+    processing tidak pernah melewati data yang belum tersimpan. Return data gabungan.
+    """
+    merged = pd.concat([pd.read_csv(p, dtype=str) for p in part_files], ignore_index=True)
+    with runner.hold_lock():
+        fd = os.open(output_path, os.O_RDWR | os.O_CREAT)
+        with os.fdopen(fd, "r+b") as out:
+            size = _trim_partial_line(out, out.seek(0, os.SEEK_END))
+            out.seek(size)
+            need_header = size == 0
+            try:
+                for part in part_files:
+                    with open(part, "rb") as f:
+                        header = f.readline()
+                        if need_header:
+                            out.write(header)
+                            need_header = False
+                        shutil.copyfileobj(f, out)
+                out.flush()
+                os.fsync(out.fileno())
+            except BaseException:
+                out.truncate(size)  # Gagal di tengah -> kembalikan ke ukuran semula
+                raise
+
+    for part in part_files:
+        os.remove(part)
+    return merged
+
+def run_parallel(scrape_fn, daftar_lokasi, output_path, max_workers, after_merge=None):
+    """
+    Scrape beberapa provinsi sekaligus di worker process (maksimal `max_workers` browser aktif).
+    `after_merge(df)` dipanggil di process utama setelah data tergabung (mis. update index listing).
+    """
+    parts_dir = get_parts_dir(output_path)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    # Sisa part dari run yang gagal sebelumnya dibuang agar tidak dobel
+    for leftover in glob.glob(os.path.join(parts_dir, "*.csv")):
+        os.remove(leftover)
+
+    print(f"⚡ Mode paralel: {len(daftar_lokasi)} provinsi, maksimal {max_workers} browser sekaligus.")
+    part_files = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for provinsi, slug in daftar_lokasi.items():
+            part_path = os.path.join(parts_dir, f"{slug}.csv")
+            futures[pool.submit(_scrape_to_part, scrape_fn, provinsi, slug, part_path)] = (provinsi, part_path)
+
+        for future in as_completed(futures):
+            provinsi, part_path = futures[future]
+            try:
+                jumlah = future.result()
+            except Exception as e:
+                print(f"   ❌ Worker {provinsi} gagal: {e}")
+                continue
+            if jumlah:
+                part_files.append(part_path)
+                print(f"   ✅ Worker {provinsi} selesai ({jumlah} data).")
+            else:
+                print(f"   ⚠️ Tidak ada data yang disimpan untuk {provinsi}.")
+
+    if part_files:
+        # Urutan tetap sesuai DAFTAR_LOKASI, bukan urutan selesai
+        order = [os.path.join(parts_dir, f"{slug}.csv") for slug in daftar_lokasi.values()]
+        merged = merge_parts([p for p in order if p in part_files], output_path)
+        print(f"   ✅ {len(part_files)} provinsi ditambahkan ke '{output_path}'")
+        if after_merge:
+            after_merge(merged)
@@ -2,10 +2,9 @@ import time
 import pandas as pd
 import random
 import os
-from selenium import webdriver
+import sys
+import argparse
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
@@ -16,6 +15,16 @@ FOLDER_NAME = "data"  # Nama folder penyimpanan
 FILE_NAME = "data_hp_jawa_fix_lokasi.csv" # Nama file output
 FULL_PATH = os.path.join(FOLDER_NAME, FILE_NAME) # Gabungan: data/data_hp_jawa_fix_lokasi.csv
 
+# Jumlah provinsi yang di-scrape bersamaan (1 = berurutan seperti biasa)
+JUMLAH_WORKER = int(os.environ.get("SCRAPER_WORKERS", "1"))
+
+# Agar modul di folder 'scraper' bisa di-import saat script dijalankan langsung
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from scraper import parallel, driver_pool, olx_page, waits, seen_index
+from pipeline import metrics
+
 DAFTAR_LOKASI = {
     "DKI Jakarta": "jakarta-dki_g2000007",
     "Jawa Barat": "jawa-barat_g2000006", # Perbaikan slug (cek ulang jika perlu)
@@ -25,136 +34,163 @@ DAFTAR_LOKASI = {
     "Banten": "banten_g2000003"
 }
 
-def run_scraper():
-    print(f"🚀 Memulai Scraping (Output Folder: {FOLDER_NAME})...")
-
-    # 1. BUAT FOLDER JIKA BELUM ADA
-    if not os.path.exists(FOLDER_NAME):
-        os.makedirs(FOLDER_NAME)
-        print(f"📂 Folder '{FOLDER_NAME}' berhasil dibuat.")
-
-    # --- LOOPING PROVINSI ---
-    for provinsi, slug in DAFTAR_LOKASI.items():
-        print(f"\n" + "="*50)
-        print(f"📍 Membuka Provinsi: {provinsi}...")
+def scrape_provinsi(provinsi, slug):
+    """Scrape 1 provinsi memakai browser dari pool. Return list data (dict) yang valid."""
+    print(f"\n" + "="*50)
+    print(f"📍 Membuka Provinsi: {provinsi}...")
+    start = time.perf_counter()
+    latencies = [] # Durasi tiap klik sampai item bertambah
+    semua_item, error = [], None
+    
+    # AMBIL BROWSER DARI POOL (dipakai ulang antar provinsi, tidak buka-tutup Chrome)
+    pool = driver_pool.get_pool(headless=False, extra_args=["--start-maximized"])
+    try:
+        driver = pool.acquire()
+    except Exception as e:
+        print(f"   ❌ Gagal membuka browser: {e}")
+        metrics.emit('scraper', 'provinsi', provinsi=provinsi, engine='selenium',
+                     durasi=round(time.perf_counter() - start, 3), error=str(e))
+        return []
+    
+    all_data_provinsi = [] # Tampung data per provinsi dulu
+
+    try:
+        url = f"https://www.olx.co.id/{slug}/handphone_c208"
+        driver.get(url)
+        waits.wait_for_items(driver) # Lanjut begitu item pertama muncul (bukan sleep tetap)
+
+        # --- FASE 1: LOAD MORE ---
+        print(f"   🔄 Memulai proses 'Load More' (Target: {TARGET_MINIMAL})...")
+        consecutive_fails = 0
+        last_item_count = 0
+        index = seen_index.get_index(FULL_PATH)
+        checked_count = 0 # Item yang sudah dicek terhadap index listing
         
-        # BUKA BROWSER BARU
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        
-        all_data_provinsi = [] # Tampung data per provinsi dulu
-
-        try:
-            url = f"https://www.olx.co.id/{slug}/handphone_c208"
-            driver.get(url)
-            time.sleep(3)
-
-            # --- FASE 1: LOAD MORE ---
-            print(f"   🔄 Memulai proses 'Load More' (Target: {TARGET_MINIMAL})...")
-            consecutive_fails = 0
-            last_item_count = 0
-            
-            while True:
-                items = driver.find_elements(By.CSS_SELECTOR, "li[data-aut-id='itemBox']")
-                current_count = len(items)
-                print(f"      -> Data terkumpul: {current_count} / {TARGET_MINIMAL}")
-
-                if current_count >= TARGET_MINIMAL:
-                    print("      ✅ Target tercapai! Lanjut ekstrak.")
-                    break
-                
-                if current_count == last_item_count and current_count > 0:
-                    consecutive_fails += 1
-                    if consecutive_fails >= 3:
-                        print("      ⚠️ Data mentok 3x. Stop klik.")
-                        break
-                else:
-                    consecutive_fails = 0
-                
-                last_item_count = current_count
-
-                try:
-                    load_btn = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "button[data-aut-id='btnLoadMore']"))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", load_btn)
-                    time.sleep(1)
-                    driver.execute_script("arguments[0].click();", load_btn)
-                    time.sleep(3) 
-                except TimeoutException:
-                    print("      ⚠️ Tombol habis/hilang.")
-                    break
-                except Exception as e:
-                    print(f"      ❌ Error klik: {e}")
+        while True:
+            current_count = olx_page.count_items(driver)
+            print(f"      -> Data terkumpul: {current_count} / {TARGET_MINIMAL}")
+
+            # Cek item yang baru termuat: kalau mayoritas sudah pernah di-scrape, stop provinsi ini
+            if current_count > checked_count:
+                links_baru = olx_page.extract_links(driver, checked_count)
+                checked_count = current_count
+                if index.fraction_seen(links_baru) >= seen_index.BATAS_SUDAH_DILIHAT:
+                    print("      🛑 Mayoritas item terbaru sudah pernah di-scrape. Stop klik.")
                     break
 
-            # --- FASE 2: EKSTRAKSI ---
-            print(f"   📝 Menyalin detail data {provinsi}...")
-            items = driver.find_elements(By.CSS_SELECTOR, "li[data-aut-id='itemBox']")
+            if current_count >= TARGET_MINIMAL:
+                print("      ✅ Target tercapai! Lanjut ekstrak.")
+                break
             
-            count_local = 0
-            for item in items:
-                try:
-                    # AMBIL JUDUL
-                    try: judul = item.find_element(By.CSS_SELECTOR, "span[data-aut-id='itemTitle']").text
-                    except: judul = "N/A"
-
-                    # AMBIL HARGA
-                    try: 
-                        harga_text = item.find_element(By.CSS_SELECTOR, "span[data-aut-id='itemPrice']").text
-                        harga_clean = harga_text.replace("Rp", "").replace(".", "").strip()
-                    except: harga_clean = "0"
-
-                    # AMBIL LOKASI (Pakai ID item-location)
-                    try: 
-                        lokasi = item.find_element(By.CSS_SELECTOR, "span[data-aut-id='item-location']").text
-                    except: 
-                        # Fallback jika ID tidak ketemu
-                        try:
-                            lokasi = provinsi # Default
-                        except:
-                            lokasi = provinsi
-                    
-                    # AMBIL LINK
-                    try: link = item.find_element(By.TAG_NAME, "a").get_attribute("href")
-                    except: link = "N/A"
-
-                    # Validasi
-                    if harga_clean == "0" or judul == "N/A": continue
-
-                    all_data_provinsi.append({
-                        "Provinsi": provinsi,
-                        "Judul": judul,
-                        "Harga": harga_clean,
-                        "Lokasi_Detail": lokasi,
-                        "Link": link
-                    })
-                    count_local += 1
-                except: continue
+            if current_count == last_item_count and current_count > 0:
+                consecutive_fails += 1
+                if consecutive_fails >= 3:
+                    print("      ⚠️ Data mentok 3x. Stop klik.")
+                    break
+            else:
+                consecutive_fails = 0
             
-            print(f"   💾 Berhasil ambil {count_local} data valid.")
-
-        except Exception as e:
-            print(f"   ❌ TERJADI ERROR DI {provinsi}: {e}")
+            last_item_count = current_count
+
+            try:
+                load_btn = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, olx_page.SEL_LOAD_MORE))
+                )
+                # Scroll + klik, lalu tunggu sampai item bertambah / tombol hilang (maks WAIT_KLIK)
+                _, latency = waits.click_and_wait(driver, load_btn, current_count)
+                latencies.append(latency)
+            except TimeoutException:
+                print("      ⚠️ Tombol habis/hilang.")
+                break
+            except Exception as e:
+                print(f"      ❌ Error klik: {e}")
+                break
+
+        print(f"      {waits.ringkas_latency(latencies)}")
+
+        # --- FASE 2: EKSTRAKSI (semua field semua item dalam 1 panggilan script) ---
+        print(f"   📝 Menyalin detail data {provinsi}...")
+        semua_item = olx_page.extract_items(driver, provinsi)
+        all_data_provinsi = index.filter_new(semua_item) # Lewati listing yang sudah ada di CSV
+        count_local = len(all_data_provinsi)
+        print(f"   ♻️ {len(semua_item) - count_local} item sudah pernah di-scrape, dilewati.")
         
-        finally:
-            driver.quit()
-            
-            # --- SIMPAN DATA KE FOLDER 'DATA' ---
-            if all_data_provinsi:
-                df = pd.DataFrame(all_data_provinsi)
-                
-                # Cek apakah file sudah ada di dalam folder data
-                file_exists = os.path.isfile(FULL_PATH)
-                
-                # Simpan mode append
-                df.to_csv(FULL_PATH, mode='a', header=not file_exists, index=False)
-                print(f"   ✅ Data {provinsi} tersimpan ke '{FULL_PATH}'")
-            else:
-                print(f"   ⚠️ Tidak ada data yang disimpan untuk {provinsi}.")
+        print(f"   💾 Berhasil ambil {count_local} data valid.")
+
+    except Exception as e:
+        print(f"   ❌ TERJADI ERROR DI {provinsi}: {e}")
+        error = str(e)
+    
+    finally:
+        pool.release(driver)
+
+    # Metrik per provinsi: waktu, jumlah klik Load More, throughput
+    durasi = time.perf_counter() - start
+    metrics.emit(
+        'scraper', 'provinsi', provinsi=provinsi, engine='selenium', durasi=round(durasi, 3),
+        klik=len(latencies), durasi_klik=round(sum(latencies), 3),
+        item_dimuat=len(semua_item), item_baru=len(all_data_provinsi),
+        item_per_detik=round(len(semua_item) / durasi, 2) if durasi > 0 else None, error=error,
+    )
+    return all_data_provinsi
+
+def simpan_data(provinsi, all_data_provinsi):
+    """Append data 1 provinsi ke CSV di folder 'data'. Return jumlah baris yang ditulis."""
+    if all_data_provinsi:
+        df = pd.DataFrame(all_data_provinsi)
+        
+        # Cek apakah file sudah ada di dalam folder data
+        file_exists = os.path.isfile(FULL_PATH)
+        
+        # Simpan mode append
+        df.to_csv(FULL_PATH, mode='a', header=not file_exists, index=False)
+        seen_index.get_index(FULL_PATH).add_links(df['Link'])
+        print(f"   ✅ Data {provinsi} tersimpan ke '{FULL_PATH}'")
+        return len(df)
+    print(f"   ⚠️ Tidak ada data yang disimpan untuk {provinsi}.")
+    return 0
+
+def run_scraper(workers=JUMLAH_WORKER, engine="selenium", base_url=olx_page.OLX_BASE_URL, record_dir=None):
+    print(f"🚀 Memulai Scraping (Output Folder: {FOLDER_NAME})...")
+    metrics.run_id() # Dibuat sebelum worker dibuat agar ikut diwariskan
+
+    with metrics.Timer('scraper', 'selesai', engine=engine, workers=workers) as metrik:
+        # 1. BUAT FOLDER JIKA BELUM ADA
+        if not os.path.exists(FOLDER_NAME):
+            os.makedirs(FOLDER_NAME)
+            print(f"📂 Folder '{FOLDER_NAME}' berhasil dibuat.")
+
+        metrik['baris_ditulis'] = 0
+        if engine == "http":
+            # --- ENGINE HTTP: tanpa browser, semua provinsi lewat 1 connection pool ---
+            from scraper import http_engine
+            index = seen_index.get_index(FULL_PATH)
+            hasil = http_engine.run(DAFTAR_LOKASI, TARGET_MINIMAL, base_url=base_url, record_dir=record_dir, seen=index)
+            for provinsi, all_data_provinsi in hasil.items():
+                metrik['baris_ditulis'] += simpan_data(provinsi, all_data_provinsi)
+        elif workers > 1:
+            # --- PARALEL: 1 worker process per provinsi, ditambahkan ke CSV utama di akhir ---
+            index = seen_index.get_index(FULL_PATH)
+
+            def after_merge(df):
+                index.add_links(df['Link'])
+                metrik['baris_ditulis'] = len(df)
+
+            parallel.run_parallel(scrape_provinsi, DAFTAR_LOKASI, FULL_PATH, workers, after_merge=after_merge)
+        else:
+            # --- LOOPING PROVINSI ---
+            for provinsi, slug in DAFTAR_LOKASI.items():
+                metrik['baris_ditulis'] += simpan_data(provinsi, scrape_provinsi(provinsi, slug))
+
+        metrik['ukuran_output'] = metrics.file_size(FULL_PATH)
 
     print("\n🎉 SELESAI SEMUA PROVINSI!")
 
 if __name__ == "__main__":
-    run_scraper()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scraper OLX (versi lokal)")
+    parser.add_argument("--workers", type=int, default=JUMLAH_WORKER, help="Jumlah provinsi yang di-scrape bersamaan")
+    parser.add_argument("--engine", choices=["selenium", "http"], default="selenium", help="selenium = browser, http = tanpa browser (asyncio)")
+    parser.add_argument("--base-url", default=olx_page.OLX_BASE_URL, help="Ganti ke alamat stub_server.py untuk pengujian lokal")
+    parser.add_argument("--record-dir", default=None, help="(engine http) simpan halaman mentah untuk diputar ulang")
+    args = parser.parse_args()
+    run_scraper(workers=args.workers, engine=args.engine, base_url=args.base_url, record_dir=args.record_dir)
@@ -0,0 +1,78 @@
+import os
+import re
+import pandas as pd
+
+# --- KONFIGURASI ---
+INDEX_FILENAME = "seen_listings.txt"  # Disimpan di samping CSV output, 1 listing id per baris (append-only)
+BATAS_SUDAH_DILIHAT = 0.8  # Stop provinsi jika >= 80% item di halaman terbaru sudah pernah di-scrape
+
+# Link OLX berakhiran "...-iid-940511850"
+LISTING_ID_RE = re.compile(r"iid-(\d+)")
+
+_index = None
+
+def listing_id(link):
+    match = LISTING_ID_RE.search(str(link))
+    return match.group(1) if match else None
+
+class SeenIndex:
+    """Index persisten listing id yang sudah pernah disimpan (dedup lintas run)"""
+
+    def __init__(self, path, bootstrap_csv=None):
+        self.path = path
+        self.ids = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.ids = {line.strip() for line in f if line.strip()}
+        elif bootstrap_csv and os.path.exists(bootstrap_csv):
+            # Index belum ada -> bangun dari kolom Link CSV yang sudah terkumpul
+            links = pd.read_csv(bootstrap_csv, usecols=["Link"])["Link"]
+            ids = links.astype(str).str.extract(LISTING_ID_RE, expand=False).dropna()
+            self._append(set(ids))
+            print(f"   🗂️ Index listing dibangun dari CSV lama ({len(self.ids)} id).")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, lid):
+        return lid in self.ids
+
+    def fraction_seen(self, links):
+        """Proporsi link yang sudah ada di index (link tanpa id dianggap baru)"""
+        ids = [listing_id(link) for link in links]
+        if not ids:
+            return 0.0
+        return sum(1 for lid in ids if lid in self.ids) / len(ids)
+
+    def filter_new(self, rows):
+        """Buang baris yang listing id-nya sudah pernah disimpan (atau dobel di batch ini)"""
+        batch, new_rows = set(), []
+        for row in rows:
+            lid = listing_id(row["Link"])
+            if lid is not None and (lid in self.ids or lid in batch):
+                continue
+            if lid is not None:
+                batch.add(lid)
+            new_rows.append(row)
+        return new_rows
+
+    def add_links(self, links):
+        """Catat link yang sudah tersimpan ke CSV"""
+        ids = {listing_id(link) for link in links} - {None}
+        self._append(ids - self.ids)
+
+    def _append(self, new_ids):
+        if not new_ids:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{lid}\n" for lid in sorted(new_ids)))
+        self.ids.update(new_ids)
+
+def get_index(csv_path):
+    """Index global per process (dibaca 1x) untuk CSV output `csv_path`"""
+    global _index
+    if _index is None:
+        path = os.path.join(os.path.dirname(csv_path), INDEX_FILENAME)
+        _index = SeenIndex(path, bootstrap_csv=csv_path)
+    return _index
@@ -0,0 +1,52 @@
+import os
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# --- STUB SERVER OLX ---
+# Memutar ulang halaman hasil rekaman engine HTTP (--record-dir) agar scraper
+# bisa diuji tanpa internet:
+#   python scraper/stub_server.py data/rekaman --port 8765
+#   python scraper/scraper_olx_to_data.py --engine http --base-url http://127.0.0.1:8765
+# Struktur folder: <root>/<slug>/page_<n>.html
+
+def make_handler(root):
+    root = os.path.realpath(root)
+
+    class RecordedPageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            parts = [p for p in parsed.path.split("/") if p]
+            page = parse_qs(parsed.query).get("page", ["1"])[0]
+
+            file_path = os.path.realpath(os.path.join(root, parts[0], f"page_{page}.html")) if parts else ""
+            # Path di luar folder rekaman (mis. /../../etc) ditolak
+            if not parts or not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+                self.send_error(404, "Halaman tidak ada di rekaman")
+                return
+
+            with open(file_path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Jangan banjiri terminal
+
+    return RecordedPageHandler
+
+def serve(root, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(root))
+    print(f"🧪 Stub OLX aktif di http://{host}:{server.server_address[1]} (rekaman: {root})")
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub server halaman OLX rekaman")
+    parser.add_argument("root", help="Folder rekaman (<slug>/page_<n>.html)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    serve(args.root, args.host, args.port).serve_forever()
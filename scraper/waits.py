@@ -0,0 +1,62 @@
+import time
+import statistics
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from scraper import olx_page
+
+# --- KONFIGURASI WAIT ---
+WAIT_HALAMAN = 15    # Batas tunggu item pertama muncul setelah driver.get
+WAIT_KLIK = 10       # Batas tunggu (ceiling) item bertambah setelah klik Load More
+POLL_DETIK = 0.2     # Seberapa sering kondisi dicek
+
+# Jumlah item + status tombol dalam 1 round trip
+STATE_JS = """
+return [document.querySelectorAll(arguments[0]).length,
+        document.querySelector(arguments[1]) !== null];
+"""
+
+def wait_for_items(driver, timeout=WAIT_HALAMAN):
+    """Ganti sleep tetap setelah driver.get: lanjut begitu item pertama muncul"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_DETIK).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, olx_page.SEL_ITEM))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def click_and_wait(driver, load_btn, prev_count, timeout=WAIT_KLIK):
+    """
+    Klik Load More lalu tunggu sampai jumlah item > prev_count atau tombol hilang
+    (maksimal `timeout` detik). Return (jumlah_item, latency_detik).
+    """
+    driver.execute_script(
+        "arguments[0].scrollIntoView({block: 'center', inline: 'center'}); arguments[0].click();",
+        load_btn,
+    )
+    start = time.perf_counter()
+
+    def _bertambah_atau_habis(d):
+        count, ada_tombol = d.execute_script(STATE_JS, olx_page.SEL_ITEM, olx_page.SEL_LOAD_MORE)
+        return count if (count > prev_count or not ada_tombol) else False
+
+    try:
+        count = WebDriverWait(driver, timeout, poll_frequency=POLL_DETIK).until(_bertambah_atau_habis)
+    except TimeoutException:
+        count = prev_count
+    return count, time.perf_counter() - start
+
+def ringkas_latency(latencies):
+    """Ringkasan latency per klik untuk dicetak di akhir provinsi"""
+    if not latencies:
+        return "⏱️ Latency klik: - (tidak ada klik)"
+    urut = sorted(latencies)
+    p90 = urut[min(len(urut) - 1, int(round(0.9 * (len(urut) - 1))))]
+    return (
+        f"⏱️ Latency klik ({len(urut)}x): rata-rata {statistics.mean(urut):.2f}s | "
+        f"median {statistics.median(urut):.2f}s | p90 {p90:.2f}s | maks {urut[-1]:.2f}s | "
+        f"total {sum(urut):.1f}s"
+    )
@@ -1,34 +1,113 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+from processing import cube as agg
 
 # --- FUNGSI 1: SCAM DETECTOR (BOX PLOT) ---
-def create_scam_detector(df, brand_choice):
+def box_stats(groups, values):
+    """
+    Statistik box plot per grup dengan NumPy (tanpa loop per grup).
+    Kuartil = interpolasi linear (sama dengan default Plotly), whisker = nilai data
+    terjauh di dalam 1.5 x IQR. Return (tabel statistik per grup, mask outlier per baris).
+    """
+    codes, names = pd.factorize(groups, sort=True)
+    values = np.asarray(values, dtype=float)
+    order = np.lexsort((values, codes))
+    v, c = values[order], codes[order]
+
+    sizes = np.bincount(c, minlength=len(names))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    def quantile(q):
+        pos = starts + q * (sizes - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, starts + sizes - 1)
+        return v[lo] + (v[hi] - v[lo]) * (pos - lo)
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    batas_bawah, batas_atas = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    outlier_sorted = (v < batas_bawah[c]) | (v > batas_atas[c])
+
+    # Whisker: min/max nilai yang bukan outlier di tiap grup
+    lowerfence = np.minimum.reduceat(np.where(outlier_sorted, np.inf, v), starts)
+    upperfence = np.maximum.reduceat(np.where(outlier_sorted, -np.inf, v), starts)
+
+    outlier = np.empty(len(values), dtype=bool)
+    outlier[order] = outlier_sorted
+    stats = pd.DataFrame({
+        'grup': names, 'n': sizes, 'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': lowerfence, 'upperfence': upperfence,
+    })
+    return stats, outlier
+
+def create_scam_detector(df, brand_choice, server_stats=True):
     """
     Membuat Box Plot untuk mendeteksi anomali harga pada brand tertentu.
+    server_stats=True: kuartil & whisker dihitung di server, browser hanya menerima
+    statistik box + titik outlier (ukuran payload tidak tergantung jumlah listing).
     """
     # Filter data berdasarkan brand yang dipilih user
     df_filtered = df[df['Brand'] == brand_choice]
+    title = f"Distribusi Harga {brand_choice} (Titik Bawah = Potensi Scam)"
     
-    fig = px.box(
-        df_filtered, 
-        x="Provinsi", 
-        y="Harga_Int", 
-        color="Provinsi",
-        points="all", # Tampilkan semua titik data
-        hover_data=["Judul", "Lokasi_Detail"], 
-        title=f"Distribusi Harga {brand_choice} (Titik Bawah = Potensi Scam)",
-        labels={"Harga_Int": "Harga (Rupiah)"}
+    if not server_stats or df_filtered.empty:
+        fig = px.box(
+            df_filtered, 
+            x="Provinsi", 
+            y="Harga_Int", 
+            color="Provinsi",
+            points="all", # Tampilkan semua titik data
+            hover_data=["Judul", "Lokasi_Detail"], 
+            title=title,
+            labels={"Harga_Int": "Harga (Rupiah)"}
+        )
+        fig.update_layout(yaxis_tickformat=",.0f") # Format angka Rp
+        return fig
+    
+    provinsi = df_filtered['Provinsi'].astype(str).to_numpy()
+    stats, outlier = box_stats(provinsi, df_filtered['Harga_Int'].to_numpy())
+    df_outlier = df_filtered[outlier]
+    colors = px.colors.qualitative.Plotly
+    
+    fig = go.Figure()
+    for i, row in enumerate(stats.itertuples(index=False)):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            x=[row.grup], name=row.grup, legendgroup=row.grup, marker_color=color,
+            q1=[row.q1], median=[row.median], q3=[row.q3],
+            lowerfence=[row.lowerfence], upperfence=[row.upperfence],
+            boxpoints=False,
+        ))
+        pts = df_outlier[provinsi[outlier] == row.grup]
+        if len(pts):
+            fig.add_trace(go.Scatter(
+                x=[row.grup] * len(pts), y=pts['Harga_Int'], mode="markers",
+                name=row.grup, legendgroup=row.grup, showlegend=False,
+                marker=dict(color=color, size=6),
+                customdata=np.stack([pts['Judul'].astype(str), pts['Lokasi_Detail'].astype(str)], axis=-1),
+                hovertemplate="Harga: Rp %{y:,.0f}<br>%{customdata[0]}<br>%{customdata[1]}<extra>Outlier</extra>",
+            ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="Provinsi",
+        yaxis_title="Harga (Rupiah)",
+        legend_title_text="Provinsi",
+        yaxis_tickformat=",.0f", # Format angka Rp
     )
-    fig.update_layout(yaxis_tickformat=",.0f") # Format angka Rp
     return fig
 
 # --- FUNGSI 2: PRICE GAP (BAR CHART) ---
-def create_price_gap(df):
+def create_price_gap(cube):
     """
     Membuat Bar Chart horizontal rata-rata harga per provinsi.
+    Input: kubus agregat (processing/cube.py), bukan listing mentah.
     """
-    # Hitung Rata-rata
-    avg_price = df.groupby('Provinsi')['Harga_Int'].mean().reset_index().sort_values('Harga_Int')
+    # Hitung Rata-rata (Total_Harga / Jumlah per provinsi)
+    avg_price = agg.rollup(cube, 'Provinsi').rename(columns={'Harga_Rata': 'Harga_Int'}).sort_values('Harga_Int')
     
     fig = px.bar(
         avg_price,
@@ -44,19 +123,24 @@ def create_price_gap(df):
     return fig
 
 # --- FUNGSI 3: EKONOMI DIGITAL (STACKED BAR) ---
-def create_economic_profile(df):
+def create_economic_profile(cube):
     """
     Membuat Histogram/Stacked Bar Chart proporsi kelas sosial.
+    Input: kubus agregat, jumlah listing per sel dipakai sebagai bobot histogram.
     """
+    counts = agg.rollup(cube, ['Provinsi', 'Kelas_Sosial'])
     fig = px.histogram(
-        df, 
+        counts, 
         y="Provinsi", 
+        x="Jumlah",
+        histfunc="sum",
         color="Kelas_Sosial", 
         barnorm="percent", # Ini bikin jadi 100% stacked
         text_auto='.0f',
         title="Komposisi Kelas Sosial Gadget per Wilayah",
-        labels={"count": "Persentase (%)"},
+        labels={"Jumlah": "Persentase (%)"},
         # Mengatur urutan warna agar konsisten
         category_orders={"Kelas_Sosial": ["Entry Level", "Mid Range", "High End", "Flagship/Sultan"]} 
     )
+    fig.update_layout(xaxis_title="Persentase (%)")
     return fig